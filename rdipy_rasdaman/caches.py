@@ -0,0 +1,478 @@
+# -*- coding: utf-8 -*-
+"""In-process caches for rasdaman catalog lookups and query results.
+
+Author: travis
+Date: Sat Oct 17 10:12:44 AM MST 2026
+"""
+import fcntl
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+_MISSING = object()
+WRITE_PATTERNS = [
+    r"^insert\s+into\s+(\w+)",
+    r"^update\s+(\w+)",
+    r"^delete\s+from\s+(\w+)",
+    r"^(?:drop|create)\s+collection\s+(\w+)"
+]
+
+
+def normalize_query(query):
+    """Return a rasql query with whitespace collapsed for use as a key."""
+    return " ".join(query.split())
+
+
+def query_collections(query):
+    """Return the collections a rasql query reads or writes.
+
+    Parameters
+    ----------
+    query : str
+        A rasql query.
+
+    Returns
+    -------
+    set | None : Collection names, or None if they could not be determined.
+    """
+    query = normalize_query(query)
+    for pattern in WRITE_PATTERNS:
+        match = re.match(pattern, query, flags=re.IGNORECASE)
+        if match:
+            return {match.group(1)}
+
+    match = re.search(r"\bfrom\s+(.+?)(?:\s+where\s+.*)?$", query,
+                      flags=re.IGNORECASE)
+    if not match:
+        return None
+
+    return {item.split()[0] for item in match.group(1).split(",")}
+
+
+def _nbytes(value):
+    """Estimate the memory held by a cached query result."""
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    data = getattr(value, "data", None)
+    if isinstance(data, list):
+        return sum(len(d) if isinstance(d, (bytes, bytearray, memoryview))
+                   else sys.getsizeof(d) for d in data)
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after a fixed time."""
+
+    def __init__(self, ttl=60):
+        """Initialize a TTLCache object.
+
+        Parameters
+        ----------
+        ttl : int | float
+            Seconds an entry stays valid. 0 disables caching. Defaults to
+            60.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of stored (possibly expired) entries."""
+        return len(self._data)
+
+    def __repr__(self):
+        """Return a TTLCache object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   {k}={v}" for k, v in self.stats.items()]
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    def get(self, key, default=None):
+        """Return a cached value, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self._data.pop(key, None)
+            self.misses += 1
+            return default
+
+    def get_or_set(self, key, func):
+        """Return a cached value, computing and storing it with `func`."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = func()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry if `key` is None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def set(self, key, value):
+        """Store a value for `ttl` seconds."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    @property
+    def stats(self):
+        """Return hit/miss counters and the current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query results bounded by total bytes."""
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """Initialize a QueryCache object.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Total size budget of cached results. Least recently used
+            results are evicted past it, and single results larger than it
+            are never cached. Defaults to 256 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached results."""
+        return len(self._data)
+
+    def __repr__(self):
+        """Return a QueryCache object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   {k}={v}" for k, v in self.stats.items()]
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    def get(self, query, default=None):
+        """Return the cached result of a query, or `default`."""
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def invalidate(self, collection=None):
+        """Drop results that read a collection, or all if it is None."""
+        with self._lock:
+            if collection is None:
+                self._data.clear()
+                self._index.clear()
+                self.nbytes = 0
+                return
+            for key in list(self._index.get(collection, ())):
+                self._remove(key)
+
+    def set(self, query, value):
+        """Cache the result of a read query."""
+        key = normalize_query(query)
+        collections = query_collections(key)
+        size = _nbytes(value)
+        if collections is None or size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (value, size, collections)
+            self.nbytes += size
+            for collection in collections:
+                self._index.setdefault(collection, set()).add(key)
+            while self.nbytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    @property
+    def stats(self):
+        """Return hit/miss/eviction counters and the memory in use."""
+        lookups = self.hits + self.misses
+        return {
+            "max_bytes": self.max_bytes,
+            "nbytes": self.nbytes,
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def _remove(self, key):
+        """Remove one entry and its index references (lock held)."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        _, size, collections = entry
+        self.nbytes -= size
+        for collection in collections:
+            keys = self._index.get(collection)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[collection]
+
+
+class TileCache:
+    """Disk cache of fetched tiles shared by processes on one machine.
+
+    Tiles are stored as `.npy` files under
+    `<directory>/<collection>/<version>/<tile key>.npy` and opened as
+    read-only memory maps on a hit. Files are written to a temporary name
+    and renamed into place, so readers in other processes never see
+    partial tiles. Hits refresh a file's modification time, and the least
+    recently used files are deleted once the directory exceeds `max_bytes`.
+
+    Every invalidation bumps a write generation kept in
+    `<directory>/.generations`, shared by all processes using the
+    directory. `version` combines the collection's generation with the
+    cache-wide one, so tiles read before a write are never served after
+    it, even if a slow reader stores them late.
+    """
+
+    def __init__(self, directory, max_bytes=10 * 1024 ** 3):
+        """Initialize a TileCache object.
+
+        Parameters
+        ----------
+        directory : str | pathlib.PosixPath
+            Cache directory, created if needed. Several processes may share
+            it.
+        max_bytes : int
+            Total size cap of the cache directory. Defaults to 10 GiB.
+        """
+        self.directory = Path(directory).expanduser().absolute()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._nbytes = self._scan()[0]
+
+    def __repr__(self):
+        """Return a TileCache object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   {k}={v}" for k, v in self.stats.items()]
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    def get(self, collection, key, version="0"):
+        """Return a cached tile as a read-only memory map, or None.
+
+        Parameters
+        ----------
+        collection : str
+            Name of the rasdaman collection the tile belongs to.
+        key : tuple
+            Tile bounds: (lo, hi) per trimmed axis or an int per sliced
+            axis.
+        version : str
+            Collection version the tile was read from. Defaults to "0".
+
+        Returns
+        -------
+        np.memmap | None : The cached tile, or None on a miss.
+        """
+        path = self._path(collection, key, version)
+        try:
+            array = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return array
+
+    def generation(self, collection=None):
+        """Return the write generation of a collection (or of the cache)."""
+        try:
+            path = self._generation_path(collection)
+            return int(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def invalidate(self, collection=None):
+        """Bump a collection's (or the cache's) generation, drop its tiles."""
+        if collection is None:
+            targets = [path for path in self.directory.iterdir()
+                       if path.name not in (".generations", ".lock")]
+        else:
+            targets = [self.directory.joinpath(collection)]
+        with self._evict_lock():
+            path = self._generation_path(collection)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(str(self.generation(collection) + 1),
+                           encoding="utf-8")
+            os.replace(tmp, path)
+            for target in targets:
+                if target.is_dir():
+                    shutil.rmtree(target, ignore_errors=True)
+                else:
+                    target.unlink(missing_ok=True)
+            self._nbytes = self._scan()[0]
+
+    def put(self, collection, key, array, version="0"):
+        """Store a tile, evicting the least recently used ones if needed.
+
+        Storing is best effort: if the tile can't be written (e.g. another
+        process invalidated the collection mid-write), it is not cached.
+
+        Parameters
+        ----------
+        collection : str
+            Name of the rasdaman collection the tile belongs to.
+        key : tuple
+            Tile bounds: (lo, hi) per trimmed axis or an int per sliced
+            axis.
+        array : np.ndarray
+            The tile's values.
+        version : str
+            Collection version the tile was read from. Defaults to "0".
+        """
+        if array.nbytes > self.max_bytes:
+            return
+        path = self._path(collection, key, version)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}."
+                             f"{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as file:
+                np.save(file, np.ascontiguousarray(array))
+            os.replace(tmp, path)
+            size = path.stat().st_size
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._nbytes += size
+            full = self._nbytes > self.max_bytes
+        if full:
+            self._evict()
+
+    @property
+    def stats(self):
+        """Return hit/miss counters and the cache directory size."""
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.directory),
+            "max_bytes": self.max_bytes,
+            "nbytes": self._nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def version(self, collection):
+        """Return the current cache version of a collection's tiles."""
+        return f"{self.generation()}.{self.generation(collection)}"
+
+    def _evict(self):
+        """Delete least recently used tiles down to 90% of `max_bytes`."""
+        with self._evict_lock():
+            nbytes, files = self._scan()
+            target = 0.9 * self.max_bytes
+            for _, size, path in sorted(files):
+                if nbytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                    nbytes -= size
+                except FileNotFoundError:
+                    continue
+            with self._lock:
+                self._nbytes = nbytes
+
+    def _evict_lock(self):
+        """Return a context manager holding the cross-process cache lock."""
+        return _FileLock(self.directory.joinpath(".lock"))
+
+    def _generation_path(self, collection):
+        """Return the file holding a (or the cache-wide) write generation."""
+        return self.directory.joinpath(".generations", collection or ".all")
+
+    def _path(self, collection, key, version):
+        """Return the file path of one tile."""
+        name = "_".join(f"{k[0]}-{k[1]}" if isinstance(k, tuple) else str(k)
+                        for k in key)
+        return self.directory.joinpath(collection, str(version), f"{name}.npy")
+
+    def _scan(self):
+        """Return total size and (mtime, size, path) of all cached tiles."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".npy"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        nbytes = sum(size for _, size, _ in files)
+        return nbytes, files
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file, shared across processes."""
+
+    def __init__(self, path):
+        """Initialize a _FileLock object."""
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        """Block until the lock is acquired."""
+        self._file = open(self.path, "a", encoding="utf-8")
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Release the lock."""
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
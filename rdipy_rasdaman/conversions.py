@@ -4,28 +4,158 @@
 TODO:
 - Use irregular grid and interpolation for WTK-based files.
     - https://stackoverflow.com/questions/26758655/how-to-make-grid-of-the-irregular-data
-- Combine years into single time-series
 
 Author: travis
 Date: Wed Dec 13 03:55:17 PM MST 2023
 """
 import datetime as dt
+import hashlib
+import os
+import re
+import time as timer
 
-from cftime import date2num
 from dateutil import parser
 from pathlib import Path
 
 import h5py
 import matplotlib.animation as ani
 import matplotlib.pyplot as plt
+import netCDF4
 import numpy as np
 import pandas as pd
 import xarray as xr
 
-from scipy.spatial import cKDTree
-from revruns.rraster import to_grid
 from revruns import rr
 
+from rdipy_rasdaman.tiling import DEFAULT_TILING, parse_tiling
+
+
+BLOCK_BYTES = 256 * 1024 ** 2
+CHUNK_BYTES = 1024 ** 2
+DST = "/data/rdi/test.nc"
+RESOLUTION = 0.16  # I happen to know that the resolution should be about 11.5 km   # <--- Variable, infer or parameterize
+
+
+def fill_value(dtype):
+    """Return the fill value used for missing cells of a given dtype."""
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.floating):
+        return np.finfo(dtype).max
+    if np.issubdtype(dtype, np.unsignedinteger):
+        return np.iinfo(dtype).max
+    return np.iinfo(dtype).min
+
+
+def parse_time_index(time_index):
+    """Parse fixed-width ISO 8601 time strings to UTC datetime64 values.
+
+    Handles "YYYY-MM-DD hh:mm:ss" strings (or with a "T" separator),
+    optionally followed by "Z" or a "+hh:mm"/"-hh:mm" UTC offset, as in
+    NREL `time_index` datasets, without a per-string Python loop.
+
+    Parameters
+    ----------
+    time_index : np.ndarray
+        Byte or unicode strings of one common length.
+
+    Returns
+    -------
+    np.ndarray : datetime64[s] values in UTC.
+    """
+    text = np.asarray(time_index)
+    if text.dtype.kind == "S":
+        text = np.char.decode(text, "ascii")
+    text = text.astype(str)
+    width = int(np.char.str_len(text).max(initial=0))
+    if width not in (19, 20, 25) or (np.char.str_len(text) != width).any():
+        raise ValueError("Time index is not in a fixed-width ISO format.")
+
+    # Character codes of each string, one row per time step
+    codes = np.ascontiguousarray(text, dtype=f"U{width}")
+    codes = codes.view(np.uint32).reshape(-1, width)
+    stamps = codes[:, :19].copy().view("U19").ravel()
+    time = stamps.astype("datetime64[s]")
+
+    if width == 20:
+        if (codes[:, 19] != ord("Z")).any():
+            raise ValueError("Unknown time zone designator.")
+    elif width == 25:
+        digits = codes[:, [20, 21, 23, 24]].astype(np.int64) - ord("0")
+        sign = np.where(codes[:, 19] == ord("-"), -1, 1)
+        minutes = sign * (digits[:, 0] * 600 + digits[:, 1] * 60
+                          + digits[:, 2] * 10 + digits[:, 3])
+        time = time - minutes.astype("timedelta64[m]")
+
+    return time
+
+
+def plan_encoding(shape, dtype, tiling=DEFAULT_TILING, complevel=4,
+                  shuffle=True, significant_digits=None):
+    """Plan NetCDF4 chunking and compression for a (time, y, x) output.
+
+    Chunks are whole rasdaman tiles: the tile shape of `tiling` clipped to
+    the grid, grown along time (in whole tiles) until a chunk holds at
+    least `CHUNK_BYTES`. Every tile then sits in exactly one chunk, so
+    wcst_import reads each chunk once per tile it writes.
+
+    Parameters
+    ----------
+    shape : tuple
+        Output (time, y, x) shape.
+    dtype : np.dtype | str
+        Stored dtype of the output variable.
+    tiling : str
+        Rasdaman tiling clause of the target coverage. Defaults to
+        `tiling.DEFAULT_TILING`.
+    complevel : int
+        zlib level from 1 to 9, 0 disables compression. Defaults to 4.
+    shuffle : bool
+        Apply the byte shuffle filter before zlib, which helps multi-byte
+        types compress. Defaults to True.
+    significant_digits : int
+        For float outputs, keep this many significant decimal digits and
+        zero the mantissa bits below them (netCDF4's GranularBitRound
+        quantization), so they compress far better. Defaults to None (no
+        quantization).
+
+    Returns
+    -------
+    dict : Keyword arguments for `netCDF4.Dataset.createVariable`.
+    """
+    dtype = np.dtype(dtype)
+    tile = [size if size is not None else axis for size, axis
+            in zip(parse_tiling(tiling), shape)]
+    chunks = [min(size, axis) for size, axis in zip(tile, shape)]
+
+    # Grow along time in whole tiles until a chunk is big enough
+    step_bytes = dtype.itemsize * int(np.prod(chunks[1:]))
+    tiles = max(-(-CHUNK_BYTES // (step_bytes * chunks[0])), 1)
+    chunks[0] = min(chunks[0] * tiles, shape[0])
+
+    encoding = {
+        "chunksizes": tuple(int(chunk) for chunk in chunks),
+        "zlib": complevel > 0,
+        "complevel": complevel,
+        "shuffle": shuffle and complevel > 0
+    }
+    if significant_digits is not None:
+        if not np.issubdtype(dtype, np.floating):
+            raise ValueError("Only float outputs can be quantized.")
+        encoding["significant_digits"] = significant_digits
+        encoding["quantize_mode"] = "GranularBitRound"
+
+    return encoding
+
+
+def cf_time(time):
+    """Return CF hour offsets and units for datetime64 values."""
+    day = time[0].astype("datetime64[D]")
+    units = f"hours since {day} 00:00"
+    values = (time - day) / np.timedelta64(1, "h")
+    if (values % 1 == 0).all():
+        values = values.astype(np.int64)
+    return values, units
+
 
 def animate(array, time_index):
     """Run a quick animation of the dataset."""
@@ -48,6 +178,161 @@ def animate(array, time_index):
     plt.show()
 
 
+class GridIndex:
+    """Precomputed mapping of point sites to cells of a regular lat/lon grid.
+
+    Built once per set of site coordinates and resolution, it holds the
+    flat index of each site's grid cell, so gridding any variable that
+    shares the site table is a single vectorized scatter. Indexes are kept
+    in memory per coordinate hash and can be saved to and loaded from
+    `.npz` files.
+    """
+
+    _cache = {}
+
+    def __init__(self, sites, cells, geom, key=None):
+        """Initialize a GridIndex object.
+
+        Parameters
+        ----------
+        sites : np.ndarray
+            Site (column) indices to grid, one per occupied cell.
+        cells : np.ndarray
+            Flat (y * nx + x) grid index of each site in `sites`.
+        geom : dict
+            Grid geotransform with "ymax", "yres", "ny", "xmin", "xres"
+            and "nx".
+        key : str
+            Hash of the site coordinates and resolution.
+        """
+        self.sites = sites
+        self.cells = cells
+        self.geom = geom
+        self.key = key
+
+    def __repr__(self):
+        """Return a GridIndex object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   {k}={v}" for k, v in self.geom.items()]
+        msgs.append(f"\n   sites={self.sites.size}")
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    @classmethod
+    def from_coords(cls, lats, lons, resolution=RESOLUTION, cache_dir=None):
+        """Build (or reuse) the grid index of a set of site coordinates.
+
+        The grid's first row and column sit on the northernmost and
+        westernmost sites. When several sites fall into one cell, the one
+        closest to the cell center is kept.
+
+        Parameters
+        ----------
+        lats, lons : array-like
+            Site latitudes and longitudes.
+        resolution : float
+            Grid cell size in degrees. Defaults to `RESOLUTION`.
+        cache_dir : str | pathlib.PosixPath
+            Directory of saved indexes, searched before building one and
+            written to after. Defaults to no disk cache.
+
+        Returns
+        -------
+        GridIndex : The index of these sites.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (lats, lons, np.float64(resolution)):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        key = digest.hexdigest()
+
+        if key in cls._cache:
+            return cls._cache[key]
+        path = None
+        if cache_dir is not None:
+            path = Path(cache_dir).joinpath(f"grid_index_{key}.npz")
+            if path.exists():
+                cls._cache[key] = cls.load(path)
+                return cls._cache[key]
+
+        # Snap each site to its cell
+        ymax, xmin = lats.max(), lons.min()
+        ypos = (ymax - lats) / resolution
+        xpos = (lons - xmin) / resolution
+        rows = np.rint(ypos).astype(np.int64)
+        cols = np.rint(xpos).astype(np.int64)
+        ny, nx = int(rows.max()) + 1, int(cols.max()) + 1
+        cells = rows * nx + cols
+
+        # Keep the site nearest to each cell center
+        offset = (ypos - rows) ** 2 + (xpos - cols) ** 2
+        order = np.lexsort((offset, cells))
+        first = np.concatenate([[True], np.diff(cells[order]) != 0])
+        sites = order[first]
+
+        geom = {
+            "ymax": ymax,
+            "yres": -resolution,
+            "ny": ny,
+            "xmin": xmin,
+            "xres": resolution,
+            "nx": nx
+        }
+        index = cls(sites, cells[sites], geom, key)
+        cls._cache[key] = index
+        if path is not None:
+            index.save(path)
+
+        return index
+
+    def grid(self, data, fill=None):
+        """Scatter (time, site) values into a (time, y, x) grid.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Values with sites along the last axis, in the order the index
+            was built from.
+        fill : int | float
+            Value of cells without a site. Defaults to
+            `fill_value(data.dtype)`.
+
+        Returns
+        -------
+        np.ndarray : Grid of `data`'s dtype.
+        """
+        data = np.asarray(data)
+        if fill is None:
+            fill = fill_value(data.dtype)
+        lead = data.shape[:-1]
+        out = np.full(lead + (self.geom["ny"] * self.geom["nx"],), fill,
+                      dtype=data.dtype)
+        out[..., self.cells] = data[..., self.sites]
+        return out.reshape(lead + (self.geom["ny"], self.geom["nx"]))
+
+    @classmethod
+    def load(cls, path):
+        """Load a GridIndex saved with `save`."""
+        with np.load(path) as npz:
+            geom = dict(zip(["ymax", "yres", "ny", "xmin", "xres", "nx"],
+                            npz["geom"].tolist()))
+            geom["ny"], geom["nx"] = int(geom["ny"]), int(geom["nx"])
+            return cls(npz["sites"], npz["cells"], geom, str(npz["key"]))
+
+    def save(self, path):
+        """Save the index to an `.npz` file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        geom = [self.geom[k] for k in ["ymax", "yres", "ny", "xmin", "xres",
+                                       "nx"]]
+        tmp = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez(tmp, sites=self.sites, cells=self.cells, geom=geom,
+                 key=self.key)
+        tmp.replace(path)
+
+
 class NREL_HDF5:
     """Methods for converting NREL HDF5 file formats in RDI."""
 
@@ -56,6 +341,7 @@ class NREL_HDF5:
         self.file = file
         self.format = format
         self.ds = self._open()
+        self._time_index = {}
 
     def __del__(self):
         """Close NREL_HDF5 object on object destruction."""
@@ -73,7 +359,8 @@ class NREL_HDF5:
         """Return an NREL_HDF5 object representation string."""
         address = hex(id(self))
         name = self.__class__.__name__
-        msgs = [f"\n   {k}={v}" for k, v in self.__dict__.items()]
+        msgs = [f"\n   {k}={v}" for k, v in self.__dict__.items()
+                if not k.startswith("_")]
         msg = " ".join(msgs)
         return f"<{name} object at {address}>: {msg}"
 
@@ -85,96 +372,344 @@ class NREL_HDF5:
         meta = meta.rr.to_geo()
         return meta
 
-    def make_grid(self, variable="cf_profile-2012"):
-        """Convert HDF5 file to grid."""
-        # Get meta object
-        meta = self.meta
-
-        # Get the target values and time indexgdal geo transform
-        data = self.ds[variable][:] / self.ds[variable].attrs["scale_factor"]
-
-        # I happen to know that the resolution should be about 11.5 km   # <--- Variable, infer or parameterize
-        resolution = 0.16
+    def block_size(self, variable="cf_profile-2012", max_bytes=BLOCK_BYTES):
+        """Return the number of time steps to read per block.
+
+        Blocks are whole multiples of the dataset's HDF5 chunk length along
+        time (so no chunk is decompressed twice) holding at most
+        `max_bytes`, but never less than one chunk.
+        """
+        dataset = self.ds[variable]
+        step_bytes = dataset.dtype.itemsize * int(np.prod(dataset.shape[1:]))
+        steps = max(max_bytes // step_bytes, 1)
+        if dataset.chunks is not None:
+            chunk = dataset.chunks[0]
+            steps = max(steps // chunk, 1) * chunk
+        return int(min(steps, dataset.shape[0]))
+
+    def grid_index(self, resolution=RESOLUTION, cache_dir=None):
+        """Return the GridIndex of this file's sites.
+
+        Only the meta coordinates are read, and indexes are shared by every
+        file (and variable) with the same site coordinates.
+
+        Parameters
+        ----------
+        resolution : float
+            Grid cell size in degrees. Defaults to `RESOLUTION`.
+        cache_dir : str | pathlib.PosixPath
+            Directory of saved indexes. Defaults to no disk cache.
+        """
+        meta = self.ds["meta"]
+        return GridIndex.from_coords(
+            meta["latitude"],
+            meta["longitude"],
+            resolution,
+            cache_dir=cache_dir
+        )
 
-        # Get the ndarray and geotransform
-        array, geom = to_grid(meta, data, resolution)
+    def iter_grid(self, variable="cf_profile-2012", block_size=None,
+                  index=None):
+        """Grid an HDF5 dataset one block of time steps at a time.
+
+        Values keep their stored (packed) dtype, see `scaling` for the CF
+        attributes that unpack them. Cells without a site get
+        `fill_value(dtype)`.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the (time, site) HDF5 dataset.
+        block_size : int
+            Time steps per block. Defaults to `block_size(variable)`.
+        index : GridIndex
+            Site to grid cell index. Defaults to `grid_index()`.
+
+        Yields
+        ------
+        tuple : Start time index, the (time, y, x) grid of the block and
+            its geotransform dict.
+        """
+        if index is None:
+            index = self.grid_index()
+
+        dataset = self.ds[variable]
+        if block_size is None:
+            block_size = self.block_size(variable)
+        for start in range(0, dataset.shape[0], block_size):
+            data = dataset[start:start + block_size]
+            yield start, index.grid(data), index.geom
 
-        return array, geom, variable
+    def make_grid(self, variable="cf_profile-2012"):
+        """Convert HDF5 file to grid, keeping the stored (packed) dtype.
+
+        This holds the whole grid in memory, `iter_grid` streams it.
+        """
+        blocks = [(array, geom) for _, array, geom in self.iter_grid(variable)]
+        array = np.concatenate([array for array, _ in blocks])
+        return array, blocks[0][1], variable
+
+    def scaling(self, variable="cf_profile-2012"):
+        """Return the CF packing attributes of an HDF5 dataset.
+
+        NREL files store `value * scale_factor`, so the CF scale_factor
+        (multiplied on read) is its inverse. Both are float32, so CF
+        readers unpack to float32.
+
+        Returns
+        -------
+        dict : "scale_factor" and "add_offset", or empty if the dataset
+            isn't packed.
+        """
+        attrs = self.ds[variable].attrs
+        if "scale_factor" not in attrs or attrs["scale_factor"] == 1:
+            return {}
+        return {
+            "scale_factor": np.float32(1 / float(attrs["scale_factor"])),
+            "add_offset": np.float32(attrs.get("add_offset", 0))
+        }
 
     @property
     def time(self):
         """Return time index in cf-compatible format."""
-        time_index = [t.decode() for t in self.ds["time_index"]]
-        time = [parser.parse(t) for t in time_index]
-        units = 'hours since {:%Y-%m-%d 00:00}'.format(time[0])
-        values = date2num(time, units)
-        return values, units
+        return cf_time(self.time_index)
+
+    @property
+    def time_index(self):
+        """Return the decoded `time_index` dataset (see `decode_time`)."""
+        return self.decode_time()
+
+    def decode_time(self, variable=None):
+        """Return the decoded time index of a dataset as UTC datetime64.
+
+        Multi-year files pair each "<name>-<year>" dataset with a
+        "time_index-<year>" dataset, other datasets use "time_index". Each
+        index is decoded once per object. Fixed-width ISO strings are
+        parsed in one vectorized pass, anything else falls back to
+        dateutil's parser.
+
+        Parameters
+        ----------
+        variable : str
+            Dataset whose time index to decode. Defaults to None, the
+            plain "time_index".
+        """
+        key = "time_index"
+        year = re.search(r"-(\d{4})$", variable or "")
+        if year and f"time_index-{year.group(1)}" in self.ds:
+            key = f"time_index-{year.group(1)}"
+
+        if key not in self._time_index:
+            raw = self.ds[key][:]
+            try:
+                time = parse_time_index(raw)
+            except ValueError:
+                time = []
+                for t in raw:
+                    t = parser.parse(t.decode() if isinstance(t, bytes)
+                                     else t)
+                    if t.tzinfo is not None:
+                        t = t.astimezone(dt.timezone.utc).replace(tzinfo=None)
+                    time.append(t)
+                time = np.array(time, dtype="datetime64[s]")
+            self._time_index[key] = time
+        return self._time_index[key]
 
     def _open(self):
         """Return open file object."""
         return h5py.File(self.file)
 
-    def main(self):
-        """Convert file to NetCDF4 file."""
-        # Get the grid and geotransform
-        array, geom, variable = self.make_grid()
-
-        # Get the time index and it's units
-        time, time_units = self.time
-
-        # Build Data Array
-        lats = [geom["ymax"] + (geom["yres"] * i) for i in range(geom["ny"])]
-        lons = [geom["xmin"] + (geom["xres"] * i) for i in range(geom["nx"])]
-        darray = xr.DataArray(
-            array,
-            coords=[time, lats, lons],
-            dims=["time", "latitude", "longitude"]
+    def main(self, dst=DST, variable="cf_profile-2012", block_size=None,
+             encoding=None):
+        """Convert file to NetCDF4 file, one block of time steps at a time.
+
+        See `combine`, which this calls with a single source.
+
+        Parameters
+        ----------
+        dst : str | pathlib.PosixPath
+            Output NetCDF4 file. Defaults to `DST`.
+        variable : str
+            Name of the (time, site) HDF5 dataset to convert.
+        block_size : int
+            Time steps per block. Defaults to `block_size(variable)`.
+        encoding : dict
+            Chunking and compression of the output variable. Defaults to
+            `plan_encoding` for the output's shape and dtype.
+
+        Returns
+        -------
+        dict : The write report of `combine`.
+        """
+        name = variable.lower().replace("-", "_")
+        return combine([(self, variable)], dst=dst, name=name,
+                       block_size=block_size, encoding=encoding)
+
+
+def combine(sources, dst=DST, name=None, block_size=None, cache_dir=None,
+            encoding=None):
+    """Convert several (time, site) NREL datasets into one gridded series.
+
+    Sources (e.g. "cf_profile-2007" ... "cf_profile-2013", in one or many
+    files) are ordered by time and must not overlap, and they must share
+    their site table, dtype and scaling. Coordinates and attributes are
+    written first with the full time axis, so the data variable is
+    allocated at its final size, then each source is gridded and written
+    block by block into its time slot. Each file is opened once and no
+    source is ever held in memory in full.
+
+    Parameters
+    ----------
+    sources : list
+        (file, variable) pairs, where file is a path or an open NREL_HDF5.
+    dst : str | pathlib.PosixPath
+        Output NetCDF4 file. Defaults to `DST`.
+    name : str
+        Output variable name. Defaults to the first variable without its
+        year suffix (e.g. "cf_profile").
+    block_size : int
+        Time steps per block. Defaults to each source's
+        `NREL_HDF5.block_size`.
+    cache_dir : str | pathlib.PosixPath
+        Directory of saved GridIndex files. Defaults to no disk cache.
+    encoding : dict
+        Chunking and compression of the output variable, as keyword
+        arguments of `netCDF4.Dataset.createVariable`. Defaults to
+        `plan_encoding` for the output's shape and dtype.
+
+    Returns
+    -------
+    dict : Write report with "path", "nbytes" (file size), "raw_nbytes"
+        (uncompressed data size), "ratio", "seconds" and "throughput"
+        (raw bytes per second).
+    """
+    # Open each file once
+    files = {}
+    entries = []
+    for file, variable in sources:
+        if not isinstance(file, NREL_HDF5):
+            file = files.setdefault(str(file), NREL_HDF5(file))
+        time = file.decode_time(variable)
+        if time.size != file.ds[variable].shape[0]:
+            raise ValueError(f"{variable} in {file.file} doesn't match its "
+                             "time index.")
+        entries.append((time[0], file, variable, time))
+    entries.sort(key=lambda entry: entry[0])
+
+    # Check that the sources line up
+    first, variable = entries[0][1], entries[0][2]
+    index = first.grid_index(cache_dir=cache_dir)
+    dtype = first.ds[variable].dtype
+    scaling = first.scaling(variable)
+    for _, file, var, _ in entries[1:]:
+        if file.grid_index(cache_dir=cache_dir).key != index.key:
+            raise ValueError(f"{file.file} has a different site table.")
+        if file.ds[var].dtype != dtype or file.scaling(var) != scaling:
+            raise ValueError(f"{var} in {file.file} is stored differently "
+                             f"than {variable}.")
+    time = np.concatenate([entry[3] for entry in entries])
+    if (np.diff(time) <= np.timedelta64(0)).any():
+        raise ValueError("Sources have overlapping or unordered time steps.")
+    if name is None:
+        name = re.sub(r"[-_]\d{4}$", "", variable).lower().replace("-", "_")
+
+    shape = (time.size, index.geom["ny"], index.geom["nx"])
+    if encoding is None:
+        encoding = plan_encoding(shape, dtype)
+
+    # Write coordinates and attributes
+    start_time = timer.perf_counter()
+    ds, attrs = _skeleton(index.geom, time, dtype, scaling)
+    ds.to_netcdf(dst, format="NETCDF4")
+
+    # Stream each source into its time slot
+    with netCDF4.Dataset(dst, "a") as nc:
+        var = nc.createVariable(
+            name,
+            dtype,
+            ("time", "latitude", "longitude"),
+            fill_value=fill_value(dtype),
+            **encoding
         )
-
-        # Data Array Attributes
-        darray.attrs["standard_name"] = "capacity_factor"    # <--- Variable, infer or parameterize
-        darray.attrs["long_name"] = "Capacity Factor"   # <--- Variable, infer or parameterize
-        darray.attrs["missing_value"] = np.finfo(darray.dtype).max
-        darray.attrs["_FillValue"] = np.finfo(darray.dtype).max
-
-        darray.attrs["valid_min"] = 0
-        darray.attrs["valid_max"] = 1
-
-        darray["latitude"].attrs["standard_name"] = "latitude"
-        darray["latitude"].attrs["long_name"] = "latitude"
-        darray["latitude"].attrs["units"] = "degrees_north"
-
-        darray["longitude"].attrs["standard_name"] = "longitude"
-        darray["longitude"].attrs["long_name"] = "longitude"
-        darray["longitude"].attrs["units"] = "degrees_east"
-
-        darray["time"].encoding["units"] = time_units
-        darray["time"].attrs["units"] = time_units
-        darray["time"].attrs["standard_name"] = "time"
-        darray["time"].attrs["long_name"] = "time"
-
-        darray["crs"] = int()
-        darray["crs"].attrs["grid_mapping_name"] = "latitude_longitude"
-        darray["crs"].attrs["longitude_of_prime_meridian"] = 0.0
-        darray["crs"].attrs["semi_major_axis"] = 6378137.0
-        darray["crs"].attrs["inverse_flattening"] = 298.257223563
-        darray.attrs["grid_mapping"] = "crs"
-
-        # Build Dataset
-        var_name = variable.lower().replace("-", "_")
-        ds = xr.Dataset(data_vars={var_name: darray})
-
-        # Global Attributes
-        ds.attrs["Conventions"] = "CF-1.7"     # <--- Double check the most recent standard version
-        ds.attrs["title"] = "reV Rep-Profile Sample"
-        ds.attrs["nc.institution"] = "Unidata"
-        ds.attrs["source"] = "reV"
-        ds.attrs["date"] = str(dt.datetime.utcnow())
-        ds.attrs["references"] = ""
-        ds.attrs["comment"] = ""
-
-        # Write to file
-        ds.to_netcdf("/data/rdi/test.nc", format="NETCDF4")
+        var.set_auto_maskandscale(False)
+        var.setncatts(attrs)
+        offset = 0
+        for _, file, variable, steps in entries:
+            for start, array, _ in file.iter_grid(variable, block_size,
+                                                  index):
+                var[offset + start:offset + start + array.shape[0]] = array
+            offset += steps.size
+
+    # Report the output size and write speed
+    seconds = timer.perf_counter() - start_time
+    nbytes = os.path.getsize(dst)
+    raw_nbytes = int(np.prod(shape)) * dtype.itemsize
+    report = {
+        "path": str(dst),
+        "nbytes": nbytes,
+        "raw_nbytes": raw_nbytes,
+        "ratio": raw_nbytes / nbytes,
+        "seconds": seconds,
+        "throughput": raw_nbytes / seconds
+    }
+
+    return report
+
+
+def _skeleton(geom, time, dtype, scaling):
+    """Return the coordinate-only output Dataset and data variable attrs."""
+    time, time_units = cf_time(time)
+    dtype = np.dtype(dtype)
+
+    # Build the coordinates
+    lats = [geom["ymax"] + (geom["yres"] * i) for i in range(geom["ny"])]
+    lons = [geom["xmin"] + (geom["xres"] * i) for i in range(geom["nx"])]
+    ds = xr.Dataset(
+        coords={"time": time, "latitude": lats, "longitude": lons}
+    )
+
+    # Data Array Attributes
+    attrs = {}
+    attrs["standard_name"] = "capacity_factor"    # <--- Variable, infer or parameterize
+    attrs["long_name"] = "Capacity Factor"   # <--- Variable, infer or parameterize
+    attrs["missing_value"] = dtype.type(fill_value(dtype))
+
+    # Packed values keep their dtype, valid range is in packed units
+    attrs.update(scaling)
+    scale = scaling.get("scale_factor", 1)
+    offset = scaling.get("add_offset", 0)
+    attrs["valid_min"] = dtype.type(round(-offset / scale))
+    attrs["valid_max"] = dtype.type(round((1 - offset) / scale))
+
+    ds["latitude"].attrs["standard_name"] = "latitude"
+    ds["latitude"].attrs["long_name"] = "latitude"
+    ds["latitude"].attrs["units"] = "degrees_north"
+
+    ds["longitude"].attrs["standard_name"] = "longitude"
+    ds["longitude"].attrs["long_name"] = "longitude"
+    ds["longitude"].attrs["units"] = "degrees_east"
+
+    ds["time"].attrs["units"] = time_units
+    ds["time"].attrs["standard_name"] = "time"
+    ds["time"].attrs["long_name"] = "time"
+
+    ds["crs"] = int()
+    ds["crs"].attrs["grid_mapping_name"] = "latitude_longitude"
+    ds["crs"].attrs["longitude_of_prime_meridian"] = 0.0
+    ds["crs"].attrs["semi_major_axis"] = 6378137.0
+    ds["crs"].attrs["inverse_flattening"] = 298.257223563
+    attrs["grid_mapping"] = "crs"
+
+    # Global Attributes
+    ds.attrs["Conventions"] = "CF-1.7"     # <--- Double check the most recent standard version
+    ds.attrs["title"] = "reV Rep-Profile Sample"
+    ds.attrs["nc.institution"] = "Unidata"
+    ds.attrs["source"] = "reV"
+    ds.attrs["date"] = str(dt.datetime.utcnow())
+    ds.attrs["references"] = ""
+    ds.attrs["comment"] = ""
+
+    return ds, attrs
 
 
 if __name__ == "__main__":
@@ -4,24 +4,47 @@
 Author: travis
 Date: Wed Nov 22 07:31:27 PM MST 2023
 """
+import asyncio
+import concurrent.futures
+import functools
+import glob
 import json
+import multiprocessing
 import os
+import re
 import subprocess as sp
+import tempfile
+import threading
+import time
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from xml.sax.saxutils import escape
 
+import numpy as np
+import pandas as pd
 import requests
 import xarray as xr
 
+from lxml import etree
 from osgeo import gdal
 from rasdapy.db_connector import DBConnector
+from rasdapy.models.ras_gmarray_builder import RasGMArrayBuilder
 from rasdapy.query_executor import QueryExecutor
 
 from rdipy_rasdaman import GEODAMAN_DIR
+from rdipy_rasdaman.caches import TTLCache, query_collections
+from rdipy_rasdaman.manifest import Manifest
+from rdipy_rasdaman.tiling import (DEFAULT_TILING, parse_tiling,
+                                   plan_tiling, tile_blocks)
 
 
 RMANHOME = os.getenv("RMANHOME")
 DATA_DIR = GEODAMAN_DIR.joinpath("data")
+CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME", "~/.cache")).expanduser()
+MANIFEST_PATH = CACHE_DIR.joinpath("rdipy_rasdaman/ingest_manifest.sqlite")
 SAMPLE = GEODAMAN_DIR.parent.joinpath("tests/data/pdsi_1895_10_sample.nc")
 USR = "rasadmin"
 PW = "rasadmin"
@@ -31,13 +54,130 @@ GROUPS = [
     "RAS_SET_TYPES"
 ]
 TYPE_MAP = {
+    "Byte": "char",
+    "Int8": "octet",
+    "Int16": "short",
+    "UInt16": "ushort",
+    "Int32": "long",
+    "UInt32": "ulong",
     "Float32": "float"
 }
+AXIS_LABELS = {
+    "time": "ansi",
+    "latitude": "Lat",
+    "longitude": "Lon"
+}
 POSSIBLE_DIMS = {
         "latitude": ["y", "ylat", "latitude", "lat"],
         "longitude": ["x", "xlon", "xlong", "longitude", "lon", "long"],
-        "time": ["time", "day", "date"]
+        "time": ["time", "day", "date", "ansi", "unix"]
+}
+NUMPY_TYPES = {
+    "bool": np.bool_,
+    "char": np.uint8,
+    "octet": np.int8,
+    "short": np.int16,
+    "ushort": np.uint16,
+    "long": np.int32,
+    "ulong": np.uint32,
+    "float": np.float32,
+    "double": np.float64
+}
+AGGREGATES = {
+    "avg": "add_cells(case when {1} then {0} else 0 end) / count_cells({1})",
+    "count": "count_cells({1})",
+    "max": "max_cells({0})",
+    "min": "min_cells({0})",
+    "sum": "add_cells(case when {1} then {0} else 0 end)"
+}
+POINT_BLOCK = 64
+POINT_DENSITY = 4
+POINT_QUERY_SIZE = 256
+NC_SIGNATURES = (b"CDF\x01", b"CDF\x02", b"CDF\x05")
+NC_SUFFIXES = (".nc", ".nc4", ".netcdf")
+NETCDF_DRIVER = "Network Common Data Format"
+SERVICE_URL = "http://localhost:8080/rasdaman/ows"
+TIME_UNITS = {
+    "ansi": "D",
+    "unix": "s"
 }
+CF_PACKING = ("scale_factor", "add_offset", "_FillValue", "missing_value")
+CF_SECONDS = {
+    "days": 86400,
+    "hours": 3600,
+    "minutes": 60,
+    "seconds": 1
+}
+TIME_TOLERANCE = np.timedelta64(1, "s")
+CRS_URL = "http://localhost:8080/rasdaman/def"
+AXIS_CRS = {
+    "ansi": f"{CRS_URL}/crs/OGC/0/AnsiDate",
+    "Lat": f"{CRS_URL}/crs/EPSG/0/4326",
+    "Lon": f"{CRS_URL}/crs/EPSG/0/4326"
+}
+COVERAGE_GML = """<?xml version="1.0" encoding="UTF-8"?>
+<gmlcov:ReferenceableGridCoverage
+    xmlns:gml="http://www.opengis.net/gml/3.2"
+    xmlns:gmlcov="http://www.opengis.net/gmlcov/1.0"
+    xmlns:gmlrgrid="http://www.opengis.net/gml/3.3/rgrid"
+    xmlns:swe="http://www.opengis.net/swe/2.0"
+    gml:id="{coverage}">
+  <gml:boundedBy>
+    <gml:Envelope srsName="{crs}" axisLabels="{labels}"
+                  srsDimension="{ndim}">
+      <gml:lowerCorner>{lower}</gml:lowerCorner>
+      <gml:upperCorner>{upper}</gml:upperCorner>
+    </gml:Envelope>
+  </gml:boundedBy>
+  <gml:domainSet>
+    <gmlrgrid:ReferenceableGridByVectors dimension="{ndim}"
+                                         gml:id="{coverage}-grid">
+      <gml:limits>
+        <gml:GridEnvelope>
+          <gml:low>{low}</gml:low>
+          <gml:high>{high}</gml:high>
+        </gml:GridEnvelope>
+      </gml:limits>
+      <gml:axisLabels>{labels}</gml:axisLabels>
+      <gmlrgrid:origin>
+        <gml:Point gml:id="{coverage}-origin" srsName="{crs}">
+          <gml:pos>{origin}</gml:pos>
+        </gml:Point>
+      </gmlrgrid:origin>
+{axes}
+    </gmlrgrid:ReferenceableGridByVectors>
+  </gml:domainSet>
+  <gml:rangeSet>
+    <gml:DataBlock>
+      <gml:rangeParameters/>
+      <gml:tupleList ts="," cs=" "/>
+    </gml:DataBlock>
+  </gml:rangeSet>
+  <gmlcov:rangeType>
+    <swe:DataRecord>
+      <swe:field name="{band}">
+        <swe:Quantity>
+          <swe:uom code="10^0"/>
+        </swe:Quantity>
+      </swe:field>
+    </swe:DataRecord>
+  </gmlcov:rangeType>
+  <gmlcov:metadata>
+    <gmlcov:Extension>
+      <covMetadata>{metadata}</covMetadata>
+    </gmlcov:Extension>
+  </gmlcov:metadata>
+</gmlcov:ReferenceableGridCoverage>
+"""
+GML_AXIS = """      <gmlrgrid:generalGridAxis>
+        <gmlrgrid:GeneralGridAxis>
+          <gmlrgrid:offsetVector
+              srsName="{crs}">{vector}</gmlrgrid:offsetVector>
+          <gmlrgrid:coefficients>{coefficients}</gmlrgrid:coefficients>
+          <gmlrgrid:gridAxesSpanned>{label}</gmlrgrid:gridAxesSpanned>
+          <gmlrgrid:sequenceRule axisOrder="+1">Linear</gmlrgrid:sequenceRule>
+        </gmlrgrid:GeneralGridAxis>
+      </gmlrgrid:generalGridAxis>"""
 
 
 class RasdamanQueryError(Exception):
@@ -48,16 +188,653 @@ class RasdamanDropError(Exception):
     """"Errors from dropping objects with rasdapy.QueryExecutor."""
 
 
+class RasdamanPoolError(Exception):
+    """"Errors from checking connections out of an RDBCPool."""
+
+
+def _cf_seconds(units):
+    """Return (seconds per unit, epoch in Unix seconds) of CF time units."""
+    match = re.match(r"\s*(\w+)\s+since\s+(.+)", units or "")
+    unit = match.group(1).lower() if match else None
+    if unit is not None and not unit.endswith("s"):
+        unit += "s"
+    if unit not in CF_SECONDS:
+        raise ValueError(f"Can't read CF time units '{units}'.")
+
+    # Reference dates come in many forms ("1800-1-1 00:00:00",
+    # "2000-01-01 00:00:00.0 UTC", ...)
+    try:
+        epoch = pd.Timestamp(match.group(2).strip())
+    except ValueError as error:
+        raise ValueError(f"Can't read the reference date of CF time units "
+                         f"'{units}'.") from error
+    if epoch.tzinfo is not None:
+        epoch = epoch.tz_convert(None)
+    offset = int((epoch - pd.Timestamp(0)) // pd.Timedelta(seconds=1))
+    return CF_SECONDS[unit], offset
+
+
+def _condense(template, cells, fill=None):
+    """Fill an AGGREGATES template with cells and their validity mask."""
+    valid = f"({cells} = {cells})"
+    if fill is not None:
+        valid = f"({valid} and ({cells} != {fill}))"
+    return template.format(cells, valid)
+
+
+def _coverage_gml(domain, band):
+    """Return a WCS-T coverage document describing a CoverageDomain.
+
+    Every axis is written as a general grid axis: regular axes with their
+    step as offset vector and no coefficients, irregular ones with a unit
+    offset vector and one coefficient per cell. Time offsets are in days,
+    as on ansidate axes. The range set is left empty, the cells are
+    written to the coverage's collection separately.
+    """
+    ndim = len(domain.labels)
+    urls = list(dict.fromkeys(AXIS_CRS[label] for label in domain.labels))
+    if len(urls) == 1:
+        crs = urls[0]
+    else:
+        parts = "&".join(f"{i}={url}" for i, url in enumerate(urls, 1))
+        crs = f"{CRS_URL}/crs-compound?{parts}"
+
+    origin, lower, upper, axes = [], [], [], []
+    for i, label in enumerate(domain.labels):
+        values = domain.coords[label]
+        corners = [values[0], values.min(), values.max()]
+        if np.issubdtype(values.dtype, np.datetime64):
+            corners = [f'"{np.datetime_as_string(v, unit="ms")}Z"'
+                       for v in corners]
+            offsets = (values - values[0]) / np.timedelta64(1, "D")
+        else:
+            corners = [repr(float(v)) for v in corners]
+            offsets = (values - values[0]).astype(float)
+        origin.append(corners[0])
+        lower.append(corners[1])
+        upper.append(corners[2])
+
+        step = _regular_step(offsets)
+        vector = ["0"] * ndim
+        vector[i] = "1" if step is None else repr(float(step))
+        coefficients = ""
+        if step is None and values.size > 1:
+            coefficients = " ".join(repr(float(o)) for o in offsets)
+        axes.append(GML_AXIS.format(crs=escape(crs), vector=" ".join(vector),
+                                    coefficients=coefficients, label=label))
+
+    metadata = "".join(f"<{k}>{v}</{k}>" for k, v in domain.attrs.items())
+
+    return COVERAGE_GML.format(
+        coverage=domain.coverage,
+        crs=escape(crs),
+        labels=" ".join(domain.labels),
+        ndim=ndim,
+        lower=" ".join(lower),
+        upper=" ".join(upper),
+        low=" ".join(str(v) for v in domain.low),
+        high=" ".join(str(v) for v in domain.high),
+        origin=" ".join(origin),
+        axes="\n".join(axes),
+        band=escape(band, {"\"": "&quot;"}),
+        metadata=metadata
+    )
+
+
+def _coverage_id(path):
+    """Return the default coverage ID of a file (its stem)."""
+    return Path(path).stem.replace("-", "_")
+
+
+def _dim_name(label):
+    """Return the xarray dimension name for a coverage axis label."""
+    for dim, possible in POSSIBLE_DIMS.items():
+        if label.lower() in possible:
+            return dim
+    return label
+
+
+@functools.lru_cache(maxsize=4096)
+def _driver(path, size, mtime):
+    """Return the GDAL driver name of a file (memoised on size/mtime)."""
+    with open(path, "rb") as file:
+        head = file.read(8)
+
+    # NetCDF classic files and NetCDF4 (HDF5) files with a NetCDF suffix
+    # don't need a GDAL open to identify
+    if head.startswith(NC_SIGNATURES):
+        return NETCDF_DRIVER
+    if head == b"\x89HDF\r\n\x1a\n" and path.endswith(NC_SUFFIXES):
+        return NETCDF_DRIVER
+
+    obj = gdal.Open(path)
+    return obj.GetDriver().LongName
+
+
+def _file_key(path):
+    """Return the (absolute path, size, mtime) memoisation key of a file."""
+    path = str(Path(path).absolute())
+    stat = os.stat(path)
+    return path, stat.st_size, stat.st_mtime_ns
+
+
+def _match_dims(available, dim):
+    """Return the dataset dimensions that look like a given dimension."""
+    possible = POSSIBLE_DIMS[dim]
+    return [avail for avail in available
+            if any(p for p in possible if p.startswith(avail))]
+
+
+@functools.lru_cache(maxsize=4096)
+def _scan_nc(path, size, mtime):
+    """Read all ingredient metadata of a NetCDF file in a single open."""
+    with xr.open_dataset(path, decode_times=True) as ds:
+        dims = {}
+        for dim in POSSIBLE_DIMS:
+            candidates = _match_dims(list(ds.dims), dim)
+            dims[dim] = candidates[0] if len(candidates) == 1 else None
+
+        times = []
+        time_units = None
+        if dims["time"] is not None:
+            times = [str(t) for t in ds[dims["time"]].data]
+            time_units = ds[dims["time"]].encoding.get("units")
+
+        crs = None
+        for name, var in ds.variables.items():
+            if "grid_mapping_name" in var.attrs or "spatial_ref" in var.attrs:
+                crs = {"variable": str(name), "attrs": dict(var.attrs)}
+                break
+
+        skip = {"crs"} if crs is None else {"crs", crs["variable"]}
+        meta = {
+            "path": path,
+            "size": size,
+            "mtime": mtime,
+            "driver": _driver(path, size, mtime),
+            "dims": dims,
+            "sizes": {str(k): int(v) for k, v in ds.sizes.items()},
+            "variables": [str(v) for v in ds if v not in skip],
+            "dtypes": {str(v): str(ds[v].encoding.get("dtype", ds[v].dtype))
+                       for v in ds if v not in skip},
+            "time": times,
+            "time_units": time_units,
+            "crs": crs
+        }
+
+    return meta
+
+
+def _gml_find(node, name):
+    """Return all descendants of an lxml node with a given local name."""
+    return [el for el in node.iter() if isinstance(el.tag, str)
+            and etree.QName(el).localname == name]
+
+
+def _gml_shift(origin, offsets, label):
+    """Return origin + offsets for numeric or quoted-date GML origins."""
+    if origin.startswith('"'):
+        start = np.datetime64(origin.strip('"').rstrip("Z"), "ns")
+        unit = TIME_UNITS.get(label.lower(), "D")
+
+        # Round to whole microseconds, float64 can't resolve nanoseconds
+        # more than ~100 days from the origin
+        scale = np.timedelta64(1, unit).astype("timedelta64[us]").astype(int)
+        shift = np.rint(offsets * scale).astype("int64")
+        return start + shift.astype("timedelta64[us]")
+    return float(origin) + offsets
+
+
+def _gml_values(text):
+    """Parse a GML coefficients list into a datetime64 or float array."""
+    tokens = text.split()
+    if tokens and tokens[0].startswith('"'):
+        values = [token.strip('"').rstrip("Z") for token in tokens]
+        return np.array(values, dtype="datetime64[ns]")
+    return np.array(tokens, dtype=float)
+
+
+def _declared_step(domain, values):
+    """Return the step a time axis is declared with, or None if irregular.
+
+    New coverages (`domain` is None) get a regular axis if `values` are
+    evenly spaced. Existing coverages keep the type and step of their time
+    axis, whatever the slices added to them look like.
+    """
+    if domain is None:
+        return _regular_step(values)
+    label = [lbl for lbl in domain.labels if _dim_name(lbl) == "time"][0]
+    if label in domain.irregular:
+        return None
+    return domain._regular.get(label, (None, _regular_step(values)))[1]
+
+
+def _regular_step(values):
+    """Return the constant spacing of a coordinate array, or None."""
+    if values.size < 2:
+        return None
+    diffs = np.diff(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        regular = (diffs == diffs[0]).all()
+    else:
+        regular = np.allclose(diffs, diffs[0], rtol=1e-6, atol=0)
+    return diffs[0] if regular and diffs[0] != 0 else None
+
+
+def _time_resolution(step):
+    """Return an ansidate axis resolution (in days) for a time step."""
+    days = step / np.timedelta64(1, "D")
+    return str(int(days)) if float(days).is_integer() else repr(float(days))
+
+
+def _time_runs(times):
+    """Split sorted datetime64 values into evenly spaced runs.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Sorted datetime64 values.
+
+    Returns
+    -------
+    list : (start, step, count) per run, with start and step in seconds
+        since the Unix epoch.
+    """
+    seconds = times.astype("datetime64[s]").astype(np.int64)
+    if seconds.size < 2:
+        return [(int(seconds[0]), 0, 1)] if seconds.size else []
+
+    # A new run starts wherever the spacing changes
+    diffs = np.diff(seconds)
+    starts = np.flatnonzero(np.diff(diffs) != 0) + 1
+    starts = np.concatenate([[0], starts])
+    stops = np.append(starts[1:], seconds.size)
+
+    return [(int(seconds[a]), int(diffs[min(a, diffs.size - 1)]), int(b - a))
+            for a, b in zip(starts, stops)]
+
+
+def _parse_subset(subset, lows, highs):
+    """Resolve a rasql subset string into per-axis trims or slice indices.
+
+    Parameters
+    ----------
+    subset : str | None
+        A rasql subset such as "[0:11, *:*, 300]". Each axis is either a
+        trim ("lo:hi", where either side may be "*") or a single slice
+        index. None selects the full domain.
+    lows, highs : list
+        Inclusive lower and upper grid bounds of the collection, used to
+        resolve "*".
+
+    Returns
+    -------
+    list : One (lo, hi) tuple per trimmed axis or an int per sliced axis.
+    """
+    if subset is None:
+        return list(zip(lows, highs))
+
+    parts = subset.strip().strip("[]").split(",")
+    if len(parts) != len(lows):
+        raise ValueError(f"Subset {subset} has {len(parts)} axes, but the "
+                         f"collection has {len(lows)}.")
+
+    bounds = []
+    for part, low, high in zip(parts, lows, highs):
+        part = part.strip()
+        if part == "*":
+            bounds.append((low, high))
+        elif ":" in part:
+            lo, hi = part.split(":")
+            lo = low if lo.strip() == "*" else int(lo)
+            hi = high if hi.strip() == "*" else int(hi)
+            bounds.append((lo, hi))
+        else:
+            bounds.append(int(part))
+
+    return bounds
+
+
+def _reduced_axes(axis, ndim):
+    """Return sorted non-negative axes to reduce, like numpy's `axis`."""
+    if axis is None:
+        return tuple(range(ndim))
+    if isinstance(axis, int):
+        axis = (axis,)
+    return tuple(sorted(a % ndim for a in axis))
+
+
+def _subset_expr(bounds, kept=None):
+    """Return a rasql subset with kept axes indexed by marray point `p`."""
+    kept = kept or []
+    parts = []
+    for i, bound in enumerate(bounds):
+        if i in kept:
+            parts.append(f"p[{kept.index(i)}]")
+        elif isinstance(bound, tuple):
+            parts.append(f"{bound[0]}:{bound[1]}")
+        else:
+            parts.append(str(bound))
+    return f"[{','.join(parts)}]"
+
+
+def _subset_query(collection, bounds):
+    """Return a rasql query selecting trims/slices from a collection."""
+    return f"select c{_subset_expr(bounds)} from {collection} as c"
+
+
+def _to_ndarray(out):
+    """Convert a rasdapy read result to an ndarray without copying cells.
+
+    Parameters
+    ----------
+    out : rasdapy.models.result_array.ResultArray
+        Output of an RDBC read query.
+
+    Returns
+    -------
+    np.ndarray : Array over the received buffer, shaped by the result's
+        spatial domain. Multi-band cells get a trailing band axis. Arrays
+        built over immutable bytes are read-only.
+    """
+    if not getattr(out, "is_object", True) or out.sdom is None:
+        return np.asarray(out.data)
+
+    if out.data_type not in NUMPY_TYPES:
+        raise TypeError(f"Cannot convert rasdaman type {out.data_type} to "
+                        "a numpy array.")
+
+    shape = [interval.hi - interval.lo + 1 for interval in out.sdom.intervals]
+    if out.number_of_bands > 1:
+        shape.append(out.number_of_bands)
+
+    # rasdapy joins all tiles (and all objects) into a single buffer
+    if len(out.data) == 1:
+        buffer = out.data[0]
+    else:
+        buffer = b"".join(out.data)
+
+    array = np.frombuffer(buffer, dtype=NUMPY_TYPES[out.data_type])
+    if array.size != int(np.prod(shape)):
+        # Several collection objects come back back to back
+        shape.insert(0, -1)
+
+    return array.reshape(shape)
+
+
+class CoverageDomain:
+    """Grid limits and axis coordinates of a rasdaman coverage."""
+
+    def __init__(self, coverage, labels, low, high, coords, attrs=None,
+                 irregular=None):
+        """Initialize a CoverageDomain object.
+
+        Parameters
+        ----------
+        coverage : str
+            Coverage ID (also the rasdaman collection name).
+        labels : list
+            Axis labels in grid order (e.g. ["ansi", "Lat", "Lon"]).
+        low, high : list
+            Inclusive lower and upper grid indices of each axis.
+        coords : dict
+            Axis label to a coordinate array with one value per grid index.
+        attrs : dict
+            CF packing attributes of the stored values ("scale_factor",
+            "add_offset", "_FillValue", "missing_value"), if any.
+        irregular : list
+            Labels of the axes declared irregular (with explicit
+            coordinates) in petascope. Defaults to the axes whose
+            coordinates are not evenly spaced.
+        """
+        self.coverage = coverage
+        self.labels = list(labels)
+        self.low = list(low)
+        self.high = list(high)
+        self.coords = coords
+        self.attrs = attrs or {}
+        self._regular = {}
+        for label, values in coords.items():
+            step = _regular_step(values)
+            if step is not None:
+                self._regular[label] = (values[0], step)
+        if irregular is None:
+            irregular = [label for label, values in coords.items()
+                         if label not in self._regular and values.size > 1]
+        self.irregular = set(irregular)
+
+    def __repr__(self):
+        """Return a CoverageDomain object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   coverage={self.coverage}"]
+        msgs += [f"\n   {label}=[{lo}:{hi}]" for label, lo, hi
+                 in zip(self.labels, self.low, self.high)]
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    @property
+    def dims(self):
+        """Return xarray dimension names in grid order."""
+        return [_dim_name(label) for label in self.labels]
+
+    @property
+    def shape(self):
+        """Return the number of grid cells along each axis."""
+        return tuple(hi - lo + 1 for lo, hi in zip(self.low, self.high))
+
+    @classmethod
+    def fetch(cls, coverage, url=SERVICE_URL, timeout=15):
+        """Build a CoverageDomain from a petascope DescribeCoverage request.
+
+        Parameters
+        ----------
+        coverage : str
+            Coverage ID to describe.
+        url : str
+            Petascope OWS endpoint. Defaults to the local service.
+        timeout : int | float
+            Request timeout in seconds. Defaults to 15.
+
+        Returns
+        -------
+        CoverageDomain : The coverage's grid and geographic domain.
+        """
+        params = {
+            "SERVICE": "WCS",
+            "VERSION": "2.0.1",
+            "REQUEST": "DescribeCoverage",
+            "COVERAGEID": coverage
+        }
+        out = requests.request(
+            url=url,
+            method="GET",
+            params=params,
+            auth=(USR, PW),
+            timeout=timeout
+        )
+        out.raise_for_status()
+        return cls.from_gml(coverage, out.content)
+
+    @classmethod
+    def from_gml(cls, coverage, gml):
+        """Build a CoverageDomain from a WCS DescribeCoverage GML document.
+
+        Handles regular (RectifiedGrid) axes and irregular
+        (ReferenceableGridByVectors) axes. Grid axes are assumed to follow
+        CRS axis order, as in the ingredients `Importer` writes. CF packing
+        attributes found in the coverage metadata are kept in `attrs`.
+        """
+        root = etree.fromstring(gml)
+        domain = _gml_find(root, "domainSet")[0]
+        labels = _gml_find(domain, "axisLabels")[0].text.split()
+        low = [int(v) for v in _gml_find(domain, "low")[0].text.split()]
+        high = [int(v) for v in _gml_find(domain, "high")[0].text.split()]
+        origin = _gml_find(domain, "pos")[0].text.split()
+
+        # Irregular axes carry their own offset vector and coefficients
+        irregular = {}
+        for axis in _gml_find(domain, "GeneralGridAxis"):
+            label = _gml_find(axis, "gridAxesSpanned")[0].text.strip()
+            vector = _gml_find(axis, "offsetVector")[0].text.split()
+            coefficients = _gml_find(axis, "coefficients")
+            text = coefficients[0].text if coefficients else None
+            irregular[label] = (vector, text)
+        vectors = [v.text.split() for v in _gml_find(domain, "offsetVector")]
+
+        coords = {}
+        steps = {}
+        declared = []
+        for i, label in enumerate(labels):
+            vector, text = irregular.get(label, (vectors[i], None))
+            step = float(vector[i])
+            if text and text.strip():
+                declared.append(label)
+                values = _gml_values(text)
+                if not np.issubdtype(values.dtype, np.datetime64):
+                    values = _gml_shift(origin[i], values * step, label)
+            else:
+                offsets = np.arange(high[i] - low[i] + 1) * step
+                values = _gml_shift(origin[i], offsets, label)
+                ends = _gml_shift(origin[i], np.array([0, step]), label)
+                steps[label] = (values[0], ends[1] - ends[0])
+            coords[label] = values
+
+        attrs = {}
+        for name in CF_PACKING:
+            elements = _gml_find(root, name)
+            if elements and elements[0].text and elements[0].text.strip():
+                attrs[name] = float(elements[0].text)
+
+        domain = cls(coverage, labels, low, high, coords, attrs, declared)
+
+        # Single-cell regular axes still have a declared step
+        for label, start_step in steps.items():
+            domain._regular.setdefault(label, start_step)
+
+        return domain
+
+    def index(self, label, values):
+        """Return the nearest grid index of coordinate values along an axis.
+
+        Parameters
+        ----------
+        label : str
+            Axis label (e.g. "Lat").
+        values : array-like
+            Coordinates along that axis (datetimes for time axes).
+
+        Returns
+        -------
+        np.ndarray : Grid indices (in the collection's sdom) of the cells
+            closest to each value.
+        """
+        axis = self.labels.index(label)
+        coords = self.coords[label]
+        values = np.asarray(values, dtype=coords.dtype)
+        if coords.size == 1:
+            return np.full(values.shape, self.low[axis])
+
+        # Regular axes are pure arithmetic, irregular ones a binary search
+        if label in self._regular:
+            start, step = self._regular[label]
+            pos = np.rint((values - start) / step).astype(int)
+            outside = (pos < 0) | (pos >= coords.size)
+            if outside.any():
+                raise ValueError(f"{int(outside.sum())} {label} value(s) "
+                                 "fall outside the domain of "
+                                 f"{self.coverage}.")
+            return pos + self.low[axis]
+
+        descending = coords[0] > coords[-1]
+        ref = coords[::-1] if descending else coords
+
+        # Reject values more than half a cell outside the axis
+        first = ref[0] - (ref[1] - ref[0]) / 2
+        last = ref[-1] + (ref[-1] - ref[-2]) / 2
+        outside = (values < first) | (values > last)
+        if outside.any():
+            raise ValueError(f"{int(outside.sum())} {label} value(s) fall "
+                             f"outside the domain of {self.coverage}.")
+
+        pos = np.searchsorted(ref, values).clip(1, ref.size - 1)
+        pos -= (values - ref[pos - 1]) <= (ref[pos] - values)
+        if descending:
+            pos = ref.size - 1 - pos
+
+        return pos + self.low[axis]
+
+    def subset(self, **ranges):
+        """Build a rasql grid subset from coordinate ranges and values.
+
+        Parameters
+        ----------
+        **ranges
+            Axis label or dimension name (e.g. time="1895-10-01" or
+            latitude=(30, 40)) to either a (lo, hi) coordinate range,
+            trimmed to the nearest cells, or a single value, sliced at the
+            nearest cell. Axes not given are selected in full.
+
+        Returns
+        -------
+        str : A grid subset such as "[0:11,210:1210,*:*]".
+        """
+        parts = ["*:*"] * len(self.labels)
+        for key, value in ranges.items():
+            dims = self.dims
+            axis = dims.index(key) if key in dims else self.labels.index(key)
+            label = self.labels[axis]
+            if isinstance(value, (tuple, list)):
+                lo, hi = sorted(self.index(label, list(value)))
+                parts[axis] = f"{lo}:{hi}"
+            else:
+                parts[axis] = str(int(self.index(label, [value])[0]))
+        return f"[{','.join(parts)}]"
+
+
 class RDBC:
     """Rasdaman Database Control object."""
 
     def __init__(self, hostname="localhost", username="rasadmin",
-                 password="rasadmin", port=7001, database="RASBASE"):
-        """Initialize an RDBC object."""
+                 password="rasadmin", port=7001, database="RASBASE",
+                 catalog_ttl=60, catalog=None, result_cache=None,
+                 tile_cache=None, domain_ttl=3600, domains=None):
+        """Initialize an RDBC object.
+
+        Parameters
+        ----------
+        hostname, username, password, port, database
+            Rasdaman connection arguments.
+        catalog_ttl : int | float
+            Seconds collection and type listings are cached before they are
+            queried again. 0 disables the cache. Defaults to 60.
+        catalog : rdipy_rasdaman.caches.TTLCache
+            Catalog cache to share with other connections to the same
+            database (an RDBCPool does this). Defaults to a new cache with
+            `catalog_ttl`.
+        result_cache : rdipy_rasdaman.caches.QueryCache
+            Opt-in cache of `read` results, keyed on the normalized query
+            and invalidated per collection by `write` and `drop`. Defaults
+            to None (no result caching).
+        tile_cache : rdipy_rasdaman.caches.TileCache
+            Opt-in disk cache of the blocks `iter_tiles` reads, shared
+            between processes. Defaults to None.
+        domain_ttl : int | float
+            Seconds a coverage's CoverageDomain is kept before petascope is
+            asked again. Writes through this object invalidate it sooner.
+            Defaults to 3600.
+        domains : rdipy_rasdaman.caches.TTLCache
+            Domain cache to share with other connections. Defaults to a new
+            cache with `domain_ttl`.
+        """
         self.hostname = hostname
         self.username = username
         self.port = port
         self.database = database
+        self.catalog = TTLCache(catalog_ttl) if catalog is None else catalog
+        self.domains = TTLCache(domain_ttl) if domains is None else domains
+        self.result_cache = result_cache
+        self.tile_cache = tile_cache
         self.db = DBConnector(
             hostname=hostname,
             port=port,
@@ -67,10 +844,13 @@ class RDBC:
         )
         self.qe = QueryExecutor(self.db)
         self.db.open()
+        self._open = True
+        self._pool = None
+        self._pool_lock = threading.Lock()
 
     def __del__(self):
         """Close database connection on object destruction."""
-        self.db.close()
+        self.close()
 
     def __enter__(self):
         """Open database connection with context management."""
@@ -78,7 +858,7 @@ class RDBC:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Close database connection with context management."""
-        self.db.close()
+        self.close()
 
     def __repr__(self):
         """Return an RDBC object representation string."""
@@ -88,12 +868,120 @@ class RDBC:
         msg = " ".join(msgs)
         return f"<{name} object at {address}>: {msg}"
 
+    def aggregate(self, collection, op, subset=None, axis=None, bins=10,
+                  value_range=None, fill=None, tile_shape=None):
+        """Reduce a collection subset inside rasdaman.
+
+        Parameters
+        ----------
+        collection : str
+            Name of the rasdaman collection.
+        op : str | np.ufunc
+            "avg", "count", "max", "min" and "sum" run as rasql
+            condensers, so only the reduced values cross the wire.
+            "histogram" counts cells per bin on the server. "var", "std"
+            and numpy ufuncs with a `reduce` method (e.g. np.multiply)
+            cannot be pushed down and are reduced client-side block by
+            block with `iter_tiles`, keeping memory bounded. "avg",
+            "count", "sum", "var" and "std" all skip NaN and `fill` cells;
+            "max", "min", "histogram" and ufuncs see every cell.
+        subset : str
+            Rasql grid subset such as "[0:11, *:*, 300:499]". Defaults to
+            None (the full collection).
+        axis : int | tuple
+            Axes of the subset (sliced axes excluded) to reduce, as in
+            numpy. Defaults to None (reduce to a scalar).
+        bins : int
+            Number of equal-width bins for "histogram". Defaults to 10.
+        value_range : tuple
+            (min, max) range of the histogram bins. Defaults to the
+            subset's minimum and maximum, computed on the server.
+        fill : int | float
+            Value marking missing cells (e.g. a packed coverage's
+            _FillValue). Defaults to None (only NaN cells are missing).
+        tile_shape : tuple
+            Cells per stored tile along every collection axis, used to
+            align the blocks of client-side reductions. Defaults to the
+            collection's stored tiling (see `tile_shape`).
+
+        Returns
+        -------
+        int | float | np.ndarray | tuple : The reduction over `axis`, or
+            (counts, edges) for "histogram".
+        """
+        lows, highs = self.sdom(collection)
+        bounds = _parse_subset(subset, lows, highs)
+        trimmed = [i for i, b in enumerate(bounds) if isinstance(b, tuple)]
+        axes = _reduced_axes(axis, len(trimmed))
+
+        if isinstance(op, str) and op == "histogram":
+            if len(axes) != len(trimmed):
+                raise ValueError("Histograms are only computed over the "
+                                 "whole subset (axis=None).")
+            return self._histogram(collection, bounds, bins, value_range)
+
+        if isinstance(op, str) and op in AGGREGATES:
+            template = AGGREGATES[op]
+            if len(axes) == len(trimmed):
+                cells = _condense(template, f"c{_subset_expr(bounds)}", fill)
+                out = self.read(f"select {cells} from {collection} as c")
+                return out.data[0]
+
+            kept = [i for j, i in enumerate(trimmed) if j not in axes]
+            domain = ",".join(f"{bounds[i][0]}:{bounds[i][1]}" for i in kept)
+            cells = _condense(template, f"c{_subset_expr(bounds, kept)}",
+                              fill)
+            query = (f"select marray p in [{domain}] values {cells} "
+                     f"from {collection} as c")
+            return self.read_array(query)
+
+        shape = [bounds[i][1] - bounds[i][0] + 1 for i in trimmed]
+        return self._aggregate_blocks(collection, subset, op, axes, shape,
+                                      fill, tile_shape)
+
+    def close(self):
+        """Close the database connection (and batch pool) if still open."""
+        if getattr(self, "_pool", None) is not None:
+            self._pool.close()
+            self._pool = None
+        if getattr(self, "_open", False):
+            self._open = False
+            self.db.close()
+
     @property
     def collections(self):
         """Return list of collections in database."""
         query = "select c from RAS_COLLECTIONNAMES as c"
-        out = self.read(query)
-        return out.data
+        collections = self.catalog.get_or_set(
+            "collections",
+            lambda: list(self.read(query).data)
+        )
+        return list(collections)
+
+    def domain(self, coverage, refresh=False):
+        """Return the cached grid and geographic domain of a coverage.
+
+        The domain is fetched from petascope once and kept in `domains`
+        until it expires or a write through this object touches the
+        coverage, so coordinate-to-index lookups need no network calls.
+
+        Parameters
+        ----------
+        coverage : str
+            Coverage ID (the rasdaman collection name).
+        refresh : bool
+            Fetch the domain again even if it is cached. Defaults to False.
+
+        Returns
+        -------
+        CoverageDomain : The coverage's domain and coordinate index.
+        """
+        if refresh:
+            self.domains.invalidate(coverage)
+        return self.domains.get_or_set(
+            coverage,
+            lambda: CoverageDomain.fetch(coverage)
+        )
 
     def drop(self, query):
         """Drop data from the database with a query.
@@ -108,6 +996,7 @@ class RDBC:
         rasdapy.query_result.QueryResult : A rasdapy output object.
         """
         out = self.qe.execute_write(query)
+        self._invalidate(query)
         if "with_error" in out.__dict__:
             if out.with_error:
                 msg = out.error_message()
@@ -145,6 +1034,113 @@ class RDBC:
             
         return out
 
+    def iter_tiles(self, collection, subset=None, tile_shape=None,
+                   prefetch=0):
+        """Read a large subset as a stream of tile-aligned blocks.
+
+        Only one block (plus `prefetch` blocks read ahead) is held in memory
+        at a time, however large the requested subset is.
+
+        Parameters
+        ----------
+        collection : str
+            Name of the rasdaman collection to read.
+        subset : str
+            Rasql grid subset such as "[0:11, *:*, 300:499]". Sliced axes
+            are dropped from every block. Defaults to None (the full
+            collection).
+        tile_shape : tuple
+            Cells per tile along every collection axis (sliced ones
+            included). Blocks are aligned to this grid so each sub-query
+            touches whole stored tiles. Defaults to the collection's
+            stored tiling (see `tile_shape`).
+        prefetch : int
+            Number of blocks to read ahead in a background thread while the
+            caller processes the current block. The thread reads over a
+            separate pooled connection, so the caller can keep querying
+            this object between blocks. Defaults to 0.
+
+        Yields
+        ------
+        tuple : (offset, block), where offset is the block's start index
+            along each trimmed axis relative to the start of the subset and
+            block is an np.ndarray.
+
+        Notes
+        -----
+        With a `tile_cache`, blocks are looked up on disk first. Cached
+        blocks are keyed by the collection's write generation (see
+        `TileCache.version`), which every write through this package
+        bumps, so blocks cached before a write are never served after it.
+        """
+        lows, highs = self.sdom(collection)
+        bounds = _parse_subset(subset, lows, highs)
+        if tile_shape is None:
+            tile_shape = self.tile_shape(collection)
+        if len(tile_shape) != len(bounds):
+            raise ValueError(f"Tile shape {tile_shape} does not match the "
+                             f"{len(bounds)} axes of {collection}.")
+
+        # Split only the trimmed axes, sliced axes are passed through
+        trimmed = [i for i, b in enumerate(bounds) if isinstance(b, tuple)]
+        blocks = tile_blocks(
+            [bounds[i] for i in trimmed],
+            [tile_shape[i] for i in trimmed],
+            [lows[i] for i in trimmed]
+        )
+
+        version = None
+        if self.tile_cache is not None:
+            version = self.tile_cache.version(collection)
+
+        def jobs():
+            for block in blocks:
+                sub = list(bounds)
+                for i, trim in zip(trimmed, block):
+                    sub[i] = trim
+                offset = tuple(trim[0] - bounds[i][0]
+                               for i, trim in zip(trimmed, block))
+                yield offset, tuple(sub)
+
+        def fetch(sub, rdbc=self):
+            if self.tile_cache is not None:
+                array = self.tile_cache.get(collection, sub, version)
+                if array is not None:
+                    return array
+            array = rdbc.read_array(_subset_query(collection, sub))
+            if self.tile_cache is not None:
+                self.tile_cache.put(collection, sub, array, version)
+            return array
+
+        if not prefetch:
+            for offset, sub in jobs():
+                yield offset, fetch(sub)
+            return
+
+        # rasdapy connections aren't thread-safe, so the read-ahead worker
+        # uses its own pooled connection, one query at a time
+        pool = self._batch_pool(1)
+
+        def fetch_pooled(sub):
+            with pool.connection() as rdbc:
+                return fetch(sub, rdbc)
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            try:
+                for offset, sub in jobs():
+                    future = executor.submit(fetch_pooled, sub)
+                    pending.append((offset, future))
+                    if len(pending) > prefetch:
+                        offset, future = pending.popleft()
+                        yield offset, future.result()
+                while pending:
+                    offset, future = pending.popleft()
+                    yield offset, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
     def list(self, pattern=None):
         """List collections in db.
 
@@ -158,14 +1154,127 @@ class RDBC:
         -------
         list : List of items, with the type depending on user arguments.
         """
-        out = self.qe.execute_read(
-            "select c from RAS_COLLECTIONNAMES as c"
-        )
-        collections = out.data
+        collections = self.collections
         if pattern:
             collections = [col for col in collections if pattern in col]
         return collections
 
+    def ping(self):
+        """Return True if the connection can still run a trivial query."""
+        try:
+            self.read("select 1")
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def point_timeseries(self, collection, points, steps=None, domain=None,
+                         max_workers=4):
+        """Extract time series at many geographic points in a few queries.
+
+        Points are snapped to grid cells once and duplicates are dropped.
+        Dense neighbourhoods of cells are read as one bounding-box trim
+        each, scattered cells as `concat`s of up to POINT_QUERY_SIZE
+        per-cell time series, and all queries run concurrently.
+
+        Parameters
+        ----------
+        collection : str
+            Name of a rasdaman collection with time, latitude and longitude
+            axes.
+        points : array-like
+            (latitude, longitude) pairs, shaped (n, 2).
+        steps : tuple
+            Inclusive (lo, hi) grid indices of the time axis to extract.
+            Defaults to None (the whole axis).
+        domain : CoverageDomain
+            Domain of the coverage. Defaults to `RDBC.domain(coverage)`.
+        max_workers : int
+            Maximum number of group queries in flight. Defaults to 4.
+
+        Returns
+        -------
+        np.ndarray : Values shaped (points, time), in the order of `points`.
+        """
+        if domain is None:
+            domain = self.domain(collection)
+        dims = domain.dims
+        if sorted(dims) != ["latitude", "longitude", "time"]:
+            raise ValueError(f"{collection} axes {domain.labels} are not "
+                             "time, latitude and longitude.")
+        itime, ilat, ilon = [dims.index(d)
+                             for d in ("time", "latitude", "longitude")]
+        if steps is None:
+            steps = (domain.low[itime], domain.high[itime])
+
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        rows = domain.index(domain.labels[ilat], points[:, 0])
+        cols = domain.index(domain.labels[ilon], points[:, 1])
+        cells, inverse = np.unique(np.stack([rows, cols], axis=1), axis=0,
+                                   return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        # Dense neighbourhoods are read as one bounding box each
+        _, groups = np.unique(cells // POINT_BLOCK, axis=0,
+                              return_inverse=True)
+        groups = groups.reshape(-1)
+        queries = []
+        members = []
+        sparse = []
+        bounds = [None] * 3
+        bounds[itime] = tuple(steps)
+        for group in np.unique(groups):
+            chunk = np.flatnonzero(groups == group)
+            (row0, col0), (row1, col1) = (cells[chunk].min(axis=0),
+                                          cells[chunk].max(axis=0))
+            area = (row1 - row0 + 1) * (col1 - col0 + 1)
+            if len(chunk) == 1 or area > POINT_DENSITY * len(chunk):
+                sparse.append(chunk)
+                continue
+            bounds[ilat] = (int(row0), int(row1))
+            bounds[ilon] = (int(col0), int(col1))
+            queries.append(_subset_query(collection, bounds))
+            members.append((chunk, row0, col0))
+
+        # Scattered cells are concatenated into shared series queries
+        if sparse:
+            sparse = np.concatenate(sparse)
+            nchunks = -(-len(sparse) // POINT_QUERY_SIZE)
+            for chunk in np.array_split(sparse, nchunks):
+                parts = []
+                for row, col in cells[chunk]:
+                    bounds[ilat] = int(row)
+                    bounds[ilon] = int(col)
+                    parts.append(f"c{_subset_expr(bounds)}")
+                if len(parts) == 1:
+                    query = f"select {parts[0]} from {collection} as c"
+                else:
+                    query = (f"select concat {' with '.join(parts)} "
+                             f"along 0 from {collection} as c")
+                queries.append(query)
+                members.append((chunk, None, None))
+
+        if len(queries) == 1:
+            results = [self.read(queries[0])]
+        else:
+            results = self.read_many(queries, max_workers=max_workers)
+
+        series = None
+        for (chunk, row0, col0), out in zip(members, results):
+            if isinstance(out, Exception):
+                raise out
+            array = _to_ndarray(out)
+            if series is None:
+                ntime = steps[1] - steps[0] + 1
+                series = np.empty((len(cells), ntime), dtype=array.dtype)
+            if row0 is None:
+                series[chunk] = array.reshape(len(chunk), -1)
+            else:
+                array = np.moveaxis(array, [ilat, ilon, itime], [0, 1, 2])
+                series[chunk] = array[cells[chunk, 0] - row0,
+                                      cells[chunk, 1] - col0]
+
+        return series[inverse]
+
     def read(self, query):
         """Read data from the database with a query.
 
@@ -178,48 +1287,717 @@ class RDBC:
         -------
         rasdapy.query_result.QueryResult : A rasdapy output object.
         """
+        if self.result_cache is not None:
+            out = self.result_cache.get(query)
+            if out is not None:
+                return out
+
         out = self.qe.execute_read(query)
         if "with_error" in out.__dict__:
             if out.with_error:
                 msg = out.error_message()
                 raise RasdamanQueryError(f"Read Error: {msg}")
+
+        if self.result_cache is not None:
+            self.result_cache.set(query, out)
+
         return out
 
+    def read_array(self, query):
+        """Read an array query directly into a numpy array.
+
+        The array is built over rasdapy's received buffer, so no cell values
+        are copied. Buffers rasdapy receives as immutable bytes give
+        read-only arrays; call `.copy()` on the result to modify it.
+
+        Parameters
+        ----------
+        query : str
+            String representation of database SQL query.
+
+        Returns
+        -------
+        np.ndarray : Query result in rasdaman grid axis order.
+        """
+        out = self.read(query)
+        return _to_ndarray(out)
+
+    def read_many(self, queries, max_workers=4, pool=None,
+                  as_completed=False):
+        """Run many read queries concurrently over pooled connections.
+
+        Parameters
+        ----------
+        queries : list
+            Rasql read queries.
+        max_workers : int
+            Maximum number of queries in flight at once. Defaults to 4.
+        pool : RDBCPool
+            Pool to run the queries on. If None, a pool with this object's
+            connection arguments and caches is opened on first use and
+            kept for later batches until `close`.
+        as_completed : bool
+            If True, return a generator yielding (index, result) pairs as
+            soon as each query finishes instead of a list in the order of
+            `queries`. Defaults to False.
+
+        Returns
+        -------
+        list | generator : Results in input order, or (index, result)
+            pairs in completion order. A query that failed holds the
+            exception it raised instead of a result, so one bad query does
+            not abort the batch.
+        """
+        queries = list(queries)
+        results = self._iter_many(queries, max_workers, pool)
+        if as_completed:
+            return results
+
+        output = [None] * len(queries)
+        for i, result in results:
+            output[i] = result
+
+        return output
+
+    def read_xarray(self, coverage, subset=None, domain=None, scale=False):
+        """Read a coverage subset into a coordinate-labeled xarray.
+
+        Packed integer coverages come back in their stored dtype, with
+        their CF packing attributes attached, unless `scale` is set.
+
+        Parameters
+        ----------
+        coverage : str
+            Coverage ID (the rasdaman collection name).
+        subset : str
+            Rasql grid subset such as "[0:11, *:*, 300:499]". Sliced axes
+            (e.g. "0") are dropped from the output and kept as scalar
+            coordinates. Defaults to None (the full coverage).
+        domain : CoverageDomain
+            Domain of the coverage. Defaults to `RDBC.domain(coverage)`.
+        scale : bool
+            Unpack the values with the coverage's scale_factor and
+            add_offset (masking fill values as NaN). Defaults to False,
+            which leaves unpacking to e.g. `xr.decode_cf` when needed.
+
+        Returns
+        -------
+        xr.DataArray : Subset with time/latitude/longitude coordinates.
+        """
+        if domain is None:
+            domain = self.domain(coverage)
+
+        bounds = _parse_subset(subset, domain.low, domain.high)
+        array = self.read_array(_subset_query(coverage, bounds))
+
+        dims = []
+        coords = {}
+        for label, dim, bound, low in zip(domain.labels, domain.dims, bounds,
+                                          domain.low):
+            values = domain.coords[label]
+            if isinstance(bound, tuple):
+                dims.append(dim)
+                coords[dim] = values[bound[0] - low:bound[1] - low + 1]
+            else:
+                coords[dim] = values[bound - low]
+        if array.ndim == len(dims) + 1:
+            dims.append("band")
+
+        darray = xr.DataArray(array, dims=dims, coords=coords, name=coverage,
+                              attrs=dict(domain.attrs))
+        if scale and domain.attrs:
+            darray = xr.decode_cf(darray.to_dataset())[coverage]
+
+        return darray
+
+    def sdom(self, collection):
+        """Return the grid bounds of a collection.
+
+        Parameters
+        ----------
+        collection : str
+            Name of the rasdaman collection.
+
+        Returns
+        -------
+        tuple : Lists of inclusive lower and upper grid indices per axis.
+        """
+        out = self.read(f"select sdom(c) from {collection} as c")
+        intervals = out.data[0].intervals
+        lows = [interval.lo for interval in intervals]
+        highs = [interval.hi for interval in intervals]
+        return lows, highs
+
+    def tile_shape(self, collection):
+        """Return the stored tile shape of a collection.
+
+        The shape is read from rasdaman's `dbinfo` of the collection (so
+        it reflects the tiling a coverage was actually created with, e.g.
+        a planned one) and kept in the catalog cache. Collections whose
+        tiling can't be read fall back to the shape of `DEFAULT_TILING`.
+
+        Parameters
+        ----------
+        collection : str
+            Name of the rasdaman collection.
+
+        Returns
+        -------
+        tuple : Number of cells along each axis of one tile, None for
+            open-ended axes.
+        """
+        def fetch():
+            query = f"select dbinfo(c) from {collection} as c"
+            try:
+                info = self.read(query).data[0]
+                if isinstance(info, (bytes, bytearray)):
+                    info = info.decode()
+                info = json.loads(str(info).strip().rstrip("\x00"))
+                if isinstance(info, list):
+                    info = info[0]
+                return parse_tiling(info["tiling"]["tileConfiguration"])
+            except (RasdamanQueryError, IndexError, KeyError, TypeError,
+                    ValueError):
+                return parse_tiling(DEFAULT_TILING)
+
+        return self.catalog.get_or_set(f"tiling:{collection}", fetch)
+
     @property
     def types(self):
         """List available database types."""
         types = {}
         for group in GROUPS:
-            gtypes = self.read(f"select t from {group} as t")
-            types[group] = gtypes.data
+            query = f"select t from {group} as t"
+            gtypes = self.catalog.get_or_set(
+                group,
+                lambda query=query: list(self.read(query).data)
+            )
+            types[group] = list(gtypes)
         return types
 
-    def write(self, query):
+    def write(self, query, array=None):
         """Write items to a database with a query.
 
         Parameters
         ----------
         query : str
             String representation of database SQL query.
+        array : np.ndarray
+            Array sent in binary with the query and referenced in it as
+            `$1` (e.g. "insert into c values $1"). Its domain starts at 0
+            on every axis, use `shift` to place it.
 
         Returns
         -------
         rasdapy.query_result.QueryResult : A rasdapy output object.
         """
-        out = self.qe.execute_write(query)
+        if array is None:
+            out = self.qe.execute_write(query)
+        else:
+            gmarray = RasGMArrayBuilder.from_np_array(
+                np.ascontiguousarray(array)
+            )
+            out = self.qe.execute_query(query, gmarray)
+        self._invalidate(query)
         if "with_error" in out.__dict__:
             if out.with_error:
                 msg = out.error_message()
                 raise RasdamanQueryError(f"Write Error: {msg}")
         return out
 
+    def _aggregate_blocks(self, collection, subset, op, axes, shape,
+                          fill=None, tile_shape=None):
+        """Reduce a subset client-side, one tile-aligned block at a time."""
+        if op in ("var", "std"):
+            ufuncs = [np.add, np.add, np.add]
+        elif isinstance(op, np.ufunc) and op.nin == 2:
+            ufuncs = [op]
+        else:
+            raise ValueError(f"Cannot aggregate with {op}. Use one of "
+                             f"{list(AGGREGATES)}, 'histogram', 'var', "
+                             "'std' or a binary numpy ufunc.")
+
+        kept = [j for j in range(len(shape)) if j not in axes]
+        totals = None
+        filled = None
+        for offset, block in self.iter_tiles(collection, subset, tile_shape):
+            if op in ("var", "std"):
+                block = block.astype(np.float64)
+                if fill is not None:
+                    block[block == fill] = np.nan
+                count = np.sum(~np.isnan(block), axis=axes)
+                parts = [count, np.nansum(block, axis=axes),
+                         np.nansum(block * block, axis=axes)]
+            else:
+                parts = [op.reduce(block, axis=axes)]
+
+            if not kept:
+                if totals is None:
+                    totals = parts
+                else:
+                    totals = [ufunc(total, part) for ufunc, total, part
+                              in zip(ufuncs, totals, parts)]
+                continue
+
+            if totals is None:
+                out_shape = [shape[j] for j in kept]
+                totals = [np.zeros(out_shape, dtype=p.dtype) for p in parts]
+                filled = np.zeros(out_shape, dtype=bool)
+
+            # Blocks are tile-aligned, so each output region is either
+            # untouched or fully covered by earlier partial results
+            region = tuple(slice(offset[j], offset[j] + block.shape[j])
+                           for j in kept)
+            first = not filled[region].any()
+            for ufunc, total, part in zip(ufuncs, totals, parts):
+                if first:
+                    total[region] = part
+                else:
+                    total[region] = ufunc(total[region], part)
+            filled[region] = True
+
+        if op in ("var", "std"):
+            count, total, squares = totals
+            mean = total / count
+            var = squares / count - mean * mean
+            return np.sqrt(var) if op == "std" else var
+
+        return totals[0]
+
+    def _batch_pool(self, max_workers):
+        """Return this object's batch pool, opening it on first use.
+
+        The pool keeps its connections warm between batches, so repeated
+        `read_many` (and `point_timeseries`) calls don't reconnect. It is
+        reopened larger if a batch needs more workers than it allows.
+        """
+        with self._pool_lock:
+            if self._pool is None or self._pool.max_size < max_workers:
+                old = self._pool
+                self._pool = RDBCPool(
+                    hostname=self.hostname,
+                    username=self.username,
+                    password=self.db.password,
+                    port=self.port,
+                    database=self.database,
+                    min_size=0,
+                    max_size=max_workers,
+                    result_cache=self.result_cache,
+                    tile_cache=self.tile_cache
+                )
+                self._pool.catalog = self.catalog
+                self._pool.domains = self.domains
+                if old is not None:
+                    old.close()
+            return self._pool
+
+    def _histogram(self, collection, bounds, bins, value_range):
+        """Count subset cells in equal-width bins on the server."""
+        cells = f"c{_subset_expr(bounds)}"
+        if value_range is None:
+            query = (f"select min_cells({cells}) from {collection} as c")
+            lo = self.read(query).data[0]
+            query = (f"select max_cells({cells}) from {collection} as c")
+            hi = self.read(query).data[0]
+        else:
+            lo, hi = value_range
+
+        # Bins are half-open, except the last one which includes `hi`
+        width = (hi - lo) / bins
+        start = f"{lo} + p[0] * {width}"
+        stop = f"{lo} + (p[0] + 1) * {width}"
+        inside = (f"{cells} >= {start} and {cells} <= {hi} and "
+                  f"({cells} < {stop} or p[0] = {bins - 1})")
+        query = (f"select marray p in [0:{bins - 1}] values "
+                 f"count_cells({inside}) from {collection} as c")
+        counts = self.read_array(query)
+        edges = np.linspace(lo, hi, bins + 1)
+
+        return counts, edges
+
+    def _invalidate(self, query):
+        """Invalidate cached catalogs and results a write query affects."""
+        self.catalog.invalidate()
+        for collection in query_collections(query) or [None]:
+            self.domains.invalidate(collection)
+        if self.result_cache is not None:
+            collections = query_collections(query)
+            if collections is None:
+                self.result_cache.invalidate()
+            else:
+                # Catalog tables change with any create or drop
+                collections |= {"RAS_COLLECTIONNAMES", *GROUPS}
+                for collection in collections:
+                    self.result_cache.invalidate(collection)
+        if self.tile_cache is not None:
+            for collection in query_collections(query) or [None]:
+                self.tile_cache.invalidate(collection)
+
+    def _iter_many(self, queries, max_workers, pool):
+        """Yield (index, result or exception) for queries as they finish."""
+        if pool is None:
+            pool = self._batch_pool(max_workers)
+
+        def run(query):
+            with pool.connection() as rdbc:
+                return rdbc.read(query)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(run, query): i
+                       for i, query in enumerate(queries)}
+            try:
+                done = concurrent.futures.as_completed(futures)
+                for future in done:
+                    error = future.exception()
+                    result = future.result() if error is None else error
+                    yield futures[future], result
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+class RDBCPool:
+    """Thread-safe pool of warm RDBC connections to one database."""
+
+    def __init__(self, hostname="localhost", username="rasadmin",
+                 password="rasadmin", port=7001, database="RASBASE",
+                 min_size=1, max_size=8, max_idle=300, timeout=30,
+                 health_check=True, catalog_ttl=60, result_cache=None,
+                 tile_cache=None, domain_ttl=3600):
+        """Initialize an RDBCPool object.
+
+        Parameters
+        ----------
+        hostname, username, password, port, database
+            Connection arguments passed to each pooled RDBC object.
+        min_size : int
+            Number of connections opened up front and never evicted for
+            being idle. Defaults to 1.
+        max_size : int
+            Maximum number of connections open at once. Checkouts beyond
+            this block until a connection is returned. Defaults to 8.
+        max_idle : int | float
+            Seconds an idle connection above `min_size` is kept before it
+            is closed. Defaults to 300.
+        timeout : int | float
+            Seconds to wait for a free connection before raising a
+            RasdamanPoolError. Defaults to 30.
+        health_check : bool
+            Ping idle connections on checkout and replace the ones that no
+            longer answer. Defaults to True.
+        catalog_ttl : int | float
+            TTL of the catalog cache shared by all pooled connections, so a
+            write through one invalidates listings for all. Defaults to 60.
+        result_cache : rdipy_rasdaman.caches.QueryCache
+            Result cache shared by all pooled connections. Defaults to None
+            (no result caching).
+        tile_cache : rdipy_rasdaman.caches.TileCache
+            Disk tile cache used by all pooled connections. Defaults to
+            None.
+        domain_ttl : int | float
+            TTL of the coverage domain cache shared by all pooled
+            connections. Defaults to 3600.
+        """
+        if min_size > max_size:
+            raise ValueError(f"min_size ({min_size}) cannot be larger than "
+                             f"max_size ({max_size}).")
+        self.hostname = hostname
+        self.username = username
+        self.port = port
+        self.database = database
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.health_check = health_check
+        self.catalog = TTLCache(catalog_ttl)
+        self.domains = TTLCache(domain_ttl)
+        self.result_cache = result_cache
+        self.tile_cache = tile_cache
+        self._password = password
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def __del__(self):
+        """Close all idle connections on object destruction."""
+        if hasattr(self, "_cond"):
+            self.close()
+
+    def __enter__(self):
+        """Return the pool with context management."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close all idle connections with context management."""
+        self.close()
+
+    def __repr__(self):
+        """Return an RDBCPool object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   {k}={v}" for k, v in self.__dict__.items()
+                if not k.startswith("_")]
+        msgs.append(f"\n   size={self.size}")
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    @property
+    def size(self):
+        """Return the number of connections currently open."""
+        return self._size
+
+    def acquire(self):
+        """Check a connection out of the pool.
+
+        Prefer `connection`, which returns the connection automatically.
+
+        Returns
+        -------
+        RDBC : An open Rasdaman Database Control object.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RasdamanPoolError("Connection pool is closed.")
+                stale = self._evict()
+                if self._idle:
+                    rdbc, _ = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    rdbc = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RasdamanPoolError(
+                        f"No connection available after {self.timeout}s "
+                        f"(max_size={self.max_size})."
+                    )
+                self._cond.wait(remaining)
+
+        for conn in stale:
+            conn.close()
+
+        if rdbc is not None and self.health_check and not rdbc.ping():
+            rdbc.close()
+            rdbc = None
+
+        if rdbc is None:
+            try:
+                rdbc = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+
+        return rdbc
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [rdbc for rdbc, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for rdbc in idle:
+            rdbc.close()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a `with` block.
+
+        Yields
+        ------
+        RDBC : An open Rasdaman Database Control object.
+        """
+        rdbc = self.acquire()
+        try:
+            yield rdbc
+        finally:
+            self.release(rdbc)
+
+    def release(self, rdbc, discard=False):
+        """Return a connection to the pool.
+
+        Parameters
+        ----------
+        rdbc : RDBC
+            A connection previously returned by `acquire`.
+        discard : bool
+            Close the connection instead of keeping it for reuse. Defaults
+            to False.
+        """
+        with self._cond:
+            keep = not (discard or self._closed)
+            if keep:
+                self._idle.append((rdbc, time.monotonic()))
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if not keep:
+            rdbc.close()
+
+    def _connect(self):
+        """Open a new RDBC connection with the pool's arguments."""
+        return RDBC(
+            hostname=self.hostname,
+            username=self.username,
+            password=self._password,
+            port=self.port,
+            database=self.database,
+            catalog=self.catalog,
+            result_cache=self.result_cache,
+            tile_cache=self.tile_cache,
+            domains=self.domains
+        )
+
+    def _evict(self):
+        """Remove connections idle past `max_idle` (call with lock held)."""
+        stale = []
+        cutoff = time.monotonic() - self.max_idle
+        while self._idle and self._size > self.min_size:
+            rdbc, last_used = self._idle[0]
+            if last_used > cutoff:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            stale.append(rdbc)
+        return stale
+
+
+class AsyncRDBC:
+    """Asyncio front-end that runs RDBC queries on pooled connections."""
+
+    def __init__(self, pool=None, max_workers=None, timeout=None, **kwargs):
+        """Initialize an AsyncRDBC object.
+
+        Parameters
+        ----------
+        pool : RDBCPool
+            Connection pool to run queries on. If None, a new pool is built
+            from `kwargs` and closed along with this object.
+        max_workers : int
+            Maximum number of queries running at once. Further queries wait
+            in the executor queue. Defaults to the pool's `max_size`.
+        timeout : int | float
+            Default per-query timeout in seconds. Defaults to None (wait
+            indefinitely).
+        **kwargs
+            Keyword arguments passed to RDBCPool when `pool` is None.
+        """
+        self._own_pool = pool is None
+        self.pool = RDBCPool(**kwargs) if pool is None else pool
+        self.max_workers = max_workers or self.pool.max_size
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="AsyncRDBC"
+        )
+
+    async def __aenter__(self):
+        """Return the object with async context management."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Shut down the executor with async context management."""
+        self.close()
+
+    def __repr__(self):
+        """Return an AsyncRDBC object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   {k}={v}" for k, v in self.__dict__.items()
+                if not k.startswith("_")]
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    def close(self):
+        """Cancel queued queries and release the executor (and own pool)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._own_pool:
+            self.pool.close()
+
+    async def drop(self, query, timeout=None):
+        """Drop data from the database with a query (see `RDBC.drop`)."""
+        return await self._run("drop", query, timeout=timeout)
+
+    async def list(self, pattern=None, timeout=None):
+        """List collections in db (see `RDBC.list`)."""
+        return await self._run("list", pattern, timeout=timeout)
+
+    async def read(self, query, timeout=None):
+        """Read data from the database with a query (see `RDBC.read`).
+
+        Parameters
+        ----------
+        query : str
+            String representation of database SQL query.
+        timeout : int | float
+            Seconds to wait for the result before raising a TimeoutError.
+            Defaults to the object's `timeout`.
+
+        Returns
+        -------
+        rasdapy.query_result.QueryResult : A rasdapy output object.
+
+        Notes
+        -----
+        Timing out or cancelling the awaiting task removes a query that has
+        not started yet from the queue. rasdapy calls cannot be interrupted,
+        so a query already running finishes in its worker thread and its
+        connection is returned to the pool afterwards.
+        """
+        return await self._run("read", query, timeout=timeout)
+
+    async def write(self, query, timeout=None):
+        """Write items to a database with a query (see `RDBC.write`)."""
+        return await self._run("write", query, timeout=timeout)
+
+    def _call(self, method, *args):
+        """Run an RDBC method on a pooled connection (in a worker thread)."""
+        with self.pool.connection() as rdbc:
+            return getattr(rdbc, method)(*args)
+
+    async def _run(self, method, *args, timeout=None):
+        """Schedule an RDBC method on the executor and await its result."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._call, method, *args)
+        future = loop.run_in_executor(self._executor, call)
+        timeout = self.timeout if timeout is None else timeout
+        return await asyncio.wait_for(future, timeout)
+
 
 class Importer(RDBC):
     """Methods for building WCST recipes for importing data."""
 
-    def __init__(self):
-        """Initialize Importer object."""
+    def __init__(self, manifest=MANIFEST_PATH, profile=None):
+        """Initialize Importer object.
+
+        Parameters
+        ----------
+        manifest : str | pathlib.PosixPath | Manifest
+            Ingest manifest (or path to its SQLite database) used to skip
+            files that were already imported. None imports every file on
+            every call. Defaults to `MANIFEST_PATH`.
+        profile : str
+            Expected access pattern of new coverages ("map", "timeseries"
+            or "balanced"), used to plan their tiling from the data's
+            shape and dtype (see `tiling.plan_tiling`). None uses
+            `DEFAULT_TILING`.
+        """
         super().__init__()
+        self.profile = profile
+        if manifest is not None and not isinstance(manifest, Manifest):
+            manifest = Manifest(manifest)
+        self.manifest = manifest
         self.rasdir = Path(RMANHOME)
         self.recipe_dir = self.rasdir.joinpath("share/rasdaman/wcst_import/"
                                                "recipes_custom")
@@ -227,23 +2005,98 @@ class Importer(RDBC):
 
     def _find_nc_dim(self, path, dim="latitude"):
         """Find the dataset string associated with a given dimension."""
-        # Open dataset and try to infer what the dim is
-        candidates = []
-        with xr.open_dataset(path) as ds:
-            possible = POSSIBLE_DIMS[dim]
-            available = list(ds.dims)
-            for avail in available:
-                if any(p for p in possible if p.startswith(avail)):
-                    candidates.append(avail)
+        # Infer what the dim is from the cached file scan
+        name = self.scan(path)["dims"][dim]
 
         # If nothing is found, alert user
-        if len(candidates) != 1:
+        if name is None:
             raise KeyError(
                 f"Could not find a possible {dim} fields. Please rename "
                 "field to {dim} and try again."
             )
 
-        return candidates[0]
+        return name
+
+    def append(self, path, collection, variable=None, mock=False,
+               quiet=False):
+        """Append the new time slices of a file to an existing coverage.
+
+        The coverage's time axis is read from its (refreshed) domain, and
+        only the file's time steps missing from it are written to a
+        temporary NetCDF and imported, so the cost of an update depends on
+        the number of new slices, not on the size of the coverage.
+
+        Parameters
+        ----------
+        path : str | PosixPath
+            Path to a NetCDF file that continues the coverage in time.
+        collection : str
+            Coverage ID to extend.
+        variable : str
+            String representing variable in `path` to be uploaded. If None,
+            this will attempt to load all available datasets.
+        mock : bool
+            If true, no data will be loaded, the process will only be
+            checked for validity.
+        quiet : bool
+            Capture the output of wcst_import instead of printing it.
+            Defaults to False.
+
+        Returns
+        -------
+        subprocess.CompletedProcess | None : The finished wcst_import run,
+            or None if the coverage already holds every time step.
+        """
+        domain = self.domain(collection, refresh=True)
+        labels = [lbl for lbl in domain.labels if _dim_name(lbl) == "time"]
+        if not labels:
+            raise ValueError(f"{collection} has no time axis to append to.")
+        existing = np.sort(domain.coords[labels[0]].astype("datetime64[ns]"))
+
+        # Find the file's time steps the coverage doesn't have yet, allowing
+        # for the rounding of coverage times rebuilt from offsets
+        time_var = self._find_nc_dim(path, "time")
+        times = np.array(self.scan(path)["time"], dtype="datetime64[ns]")
+        after = np.searchsorted(existing, times).clip(0, existing.size - 1)
+        before = (after - 1).clip(0)
+        gap = np.minimum(np.abs(existing[after] - times),
+                         np.abs(existing[before] - times))
+        new = gap > TIME_TOLERANCE
+        if not new.any():
+            if not quiet:
+                print(f"{collection} already holds every time step in "
+                      f"{path}, skipping...")
+            return None
+        if times[new].min() <= existing.max():
+            raise ValueError(f"{path} has new time steps before the end of "
+                             f"{collection} ({existing.max()}), append "
+                             "can only extend the time axis.")
+
+        # Import only the new slices
+        fd, tmp = tempfile.mkstemp(prefix=f"{collection}_", suffix=".nc")
+        os.close(fd)
+        try:
+            with xr.open_dataset(path) as ds:
+                ds.isel({time_var: np.flatnonzero(new)}).to_netcdf(tmp)
+            ingredients = self._ingredients_nc(tmp, variable, mock=mock,
+                                               domain=domain)
+            ingredients["input"]["coverage_id"] = collection
+            out = self._run_import(ingredients, quiet=quiet)
+        finally:
+            os.remove(tmp)
+
+        if not mock:
+            ingredients["input"]["paths"] = [str(path)]
+            self._record([path], ingredients, out)
+
+        return out
+
+    def dropcol(self, collection):
+        """Drop a coverage and forget the manifest entries of its files."""
+        out = super().dropcol(collection)
+        if self.manifest is not None:
+            self.manifest.forget(coverage=collection)
+        return out
 
     def get_driver(self, path):
         """Return the appropriate driver for a file (must be GDAL-compatible).
@@ -254,23 +2107,138 @@ class Importer(RDBC):
         -------
         str : A string representation of the driver appropriate to this file.
         """
-        obj = gdal.Open(str(path))
-        driver = obj.GetDriver().LongName
-        return driver
+        return _driver(*_file_key(path))
 
     def get_crs(self, path):
-        """Return the appropriate CRS ingredient string for a file."""
-        # ds = xr.open_dataset(path)
-        return "crs"
+        """Return the appropriate CRS ingredient string for a file.
+
+        This is the name of the file's grid mapping variable from the
+        cached scan, or "EPSG:4326" for files on plain latitude/longitude
+        dimensions. None means the file isn't georeferenced.
+        """
+        meta = self.scan(path)
+        if meta["crs"] is not None:
+            return meta["crs"]["variable"]
+        if meta["dims"]["latitude"] and meta["dims"]["longitude"]:
+            return "EPSG:4326"
+        return None
 
     def help(self):
         """Print help text for wcst import method."""
         sp.run([self.wcst_import, "--help"], shell=False,
                executable="/bin/bash", check=True)
 
-    def load(self, path, variable=None, mock=False):
+    def insert_array(self, collection, array, coords=None):
+        """Write an array straight into a new rasdaman coverage.
+
+        The coverage is first registered in petascope with a WCS-T
+        InsertCoverage request that carries only its geographic domain,
+        CF packing attributes, cell type (through `TYPE_MAP`) and tiling.
+        The array is then sent tile by tile as binary queries into the
+        collection petascope created (an insert for the first tile if the
+        collection holds no object yet, updates for the rest), so no
+        intermediate data file is written and only one tile is held in
+        memory at a time for lazily loaded xarray data. The coverage is
+        dropped again if a write fails or the collection's `sdom` doesn't
+        match the array afterwards.
+
+        Parameters
+        ----------
+        collection : str
+            Coverage ID (and collection name) to create.
+        array : np.ndarray | xr.DataArray
+            2D (latitude, longitude) or 3D (time, latitude, longitude)
+            grid.
+        coords : dict
+            Dimension name to coordinate values, in axis order. Defaults
+            to the coordinates of an xr.DataArray.
+
+        Returns
+        -------
+        CoverageDomain : The coverage's grid and geographic domain.
+        """
+        if coords is None:
+            coords = {dim: array[dim].values for dim in array.dims}
+        if len(coords) != array.ndim:
+            raise ValueError(f"Got {len(coords)} coordinate arrays for a "
+                             f"{array.ndim}D array.")
+        labels = [AXIS_LABELS.get(_dim_name(dim)) for dim in coords]
+        if None in labels:
+            raise ValueError(f"Cannot georeference dimensions {list(coords)}, "
+                             "use time, latitude and longitude.")
+        if collection in self.collections:
+            raise ValueError(f"Collection {collection} already exists.")
+
+        # Find the rasdaman cell type through TYPE_MAP
+        dtype = np.dtype(array.dtype)
+        name = "Byte" if dtype == np.uint8 else dtype.name.title()
+        name = name.replace("Ui", "UI")
+        if name not in TYPE_MAP:
+            raise TypeError(f"Cannot store {dtype} arrays in rasdaman, use "
+                            f"one of {list(TYPE_MAP)}.")
+
+        # Plan the tiling
+        if self.profile is None and array.ndim == 3:
+            tiling = DEFAULT_TILING
+        else:
+            tiling = plan_tiling(array.shape, dtype.itemsize,
+                                 self.profile or "map")["clause"]
+        bounds = [(0, size - 1) for size in array.shape]
+        tile_shape = [size or bound[1] + 1 for size, bound
+                      in zip(parse_tiling(tiling), bounds)]
+
+        # Register the geographic domain and any CF packing attributes
+        attrs = getattr(array, "attrs", {})
+        domain = CoverageDomain(
+            collection,
+            labels,
+            [0] * array.ndim,
+            [size - 1 for size in array.shape],
+            {label: np.asarray(values) for label, values
+             in zip(labels, coords.values())},
+            {k: v for k, v in attrs.items() if k in CF_PACKING}
+        )
+        band = getattr(array, "name", None) or collection
+        self._insert_coverage(domain, str(band), name, tiling)
+
+        # Send one tile per query, inserting the first one if petascope
+        # created an empty collection
+        try:
+            oids = self.read(f"select oid(c) from {collection} as c").data
+            empty = not len(oids)
+            for block in tile_blocks(bounds, tile_shape):
+                slices = tuple(slice(lo, hi + 1) for lo, hi in block)
+                tile = np.asarray(getattr(array[slices], "values",
+                                          array[slices]))
+                shift = f"shift($1, [{','.join(str(b[0]) for b in block)}])"
+                if empty:
+                    query = (f"insert into {collection} values {shift} "
+                             f"tiling {tiling}")
+                    empty = False
+                else:
+                    query = f"update {collection} as c set c assign {shift}"
+                self.write(query, tile)
+
+            lows, highs = self.sdom(collection)
+            if list(lows) != domain.low or list(highs) != domain.high:
+                raise RasdamanQueryError(
+                    f"Collection {collection} covers {lows} to {highs}, "
+                    f"expected {domain.low} to {domain.high}."
+                )
+        except Exception:
+            self.dropcol(collection)
+            raise
+
+        return self.domain(collection)
+
+    def load(self, path, variable=None, mock=False, quiet=False,
+             force=False):
         """Import file into Rasdaman database.
 
+        Files whose last import succeeded and whose contents haven't
+        changed since (according to the manifest) are skipped, so re-runs
+        only import new or modified files.
+
         Parameters
         ----------
         path : str | PosixPath
@@ -281,31 +2249,164 @@ class Importer(RDBC):
         mock : bool
             If true, no data will be loaded, the process will only be
             checked for validity.
+        quiet : bool
+            Capture the output of wcst_import instead of printing it.
+            Defaults to False.
+        force : bool
+            Import the file even if the manifest lists it as already
+            imported. Defaults to False.
+
+        Returns
+        -------
+        subprocess.CompletedProcess | None : The finished wcst_import run,
+            or None if the file was skipped as unchanged.
+        """
+        if self._skip([path], mock, force, quiet, _coverage_id(path)):
+            return None
+
+        ingredients = self._load_ingredients(path, variable, mock)
+        out = self._run_import(ingredients, quiet=quiet)
+        if not mock:
+            self._record([path], ingredients, out)
+        return out
+
+    def load_many(self, paths, variable=None, mock=False, workers=4,
+                  max_pending=None, force=False):
+        """Import many files into Rasdaman database in parallel.
+
+        Manifest checks and ingredients are handled in this process, and
+        each file's wcst_import run goes to a pool of spawned worker
+        processes, which hold no database connection of their own (forking
+        a live rasdapy gRPC channel is unsafe). At most `max_pending`
+        files are queued at once, so a long (or lazily generated) list of
+        paths doesn't flood the pool or rasdaman.
+
+        Parameters
+        ----------
+        paths : list | generator
+            Paths to files to load into Rasdaman.
+        variable : str
+            String representing variable in each file to be uploaded. If
+            None, this will attempt to load all available datasets.
+        mock : bool
+            If true, no data will be loaded, the process will only be
+            checked for validity.
+        workers : int
+            Number of worker processes (and concurrent imports). Defaults
+            to 4.
+        max_pending : int
+            Maximum number of files submitted but not yet finished.
+            Defaults to twice `workers`.
+        force : bool
+            Import files even if the manifest lists them as already
+            imported. Defaults to False.
+
+        Returns
+        -------
+        list : One report dict per path, in input order, with "path",
+            "status" ("ok", "failed" or "skipped"), "returncode", "seconds"
+            and "error".
         """
-        # Check if georeferencing information is available
-        crs = self.get_crs(path)
-        if crs:
-            # Write temporary ingredients file
-            dst = Path("./tmp_ingredients.json").absolute()
-            ingredients = self.make_ingredients(path, variable, mock=mock)
-            with open(dst, "w", encoding="utf-8") as file:
-                file.write(json.dumps(ingredients, indent=4))
-
-            # Call the import wcst script
-            _ = sp.run(
-                f"{str(self.wcst_import)} {dst} --identity-file ~/.rasdaman",
-                shell=True,
-                check=False,
-                executable="/bin/bash"
-            )
-            os.remove(dst)
+        max_pending = max_pending or 2 * workers
+        reports = {}
+        order = []
+        pending = {}
+
+        def finish(future):
+            path, report, out = future.result()
+            ingredients = pending.pop(future)
+            reports[path] = report
+            if out is not None and not mock:
+                self._record([path], ingredients, out)
+                self._invalidate(f"update {_coverage_id(path)}")
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=context) as executor:
+            for path in paths:
+                path = str(path)
+                order.append(path)
+                report = {"path": path, "status": "failed",
+                          "returncode": None, "seconds": 0.0, "error": None}
+                try:
+                    coverage = _coverage_id(path)
+                    if self._skip([path], mock, force, True, coverage):
+                        reports[path] = {**report, "status": "skipped"}
+                        continue
+                    ingredients = self._load_ingredients(path, variable, mock)
+                except Exception as error:  # pylint: disable=broad-except
+                    report["error"] = f"{type(error).__name__}: {error}"
+                    reports[path] = report
+                    continue
+
+                future = executor.submit(_import_job, str(self.wcst_import),
+                                         path, ingredients)
+                pending[future] = ingredients
+                if len(pending) >= max_pending:
+                    done, _ = concurrent.futures.wait(
+                        list(pending),
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        finish(future)
+            for future in concurrent.futures.as_completed(list(pending)):
+                finish(future)
+
+        return [reports[path] for path in order]
+
+    def load_series(self, paths, variable=None, collection=None, mock=False,
+                    quiet=False, force=False):
+        """Import a series of files into one coverage with one wcst_import.
+
+        Files the manifest lists as already imported and unchanged are
+        left out, so re-runs over a growing series only append the slices
+        of new or modified files.
 
-        else:
-            # No need to try and georeference this
-            print(f"No CRS object found in {path}, uploading native "
-                  "geometries...")
-            raise NotImplementedError("I haven't built non-georeferenced "
-                                      "netcdfs into the load method yet.")
+        Parameters
+        ----------
+        paths : str | list
+            Glob pattern or list of NetCDF files that together make up one
+            coverage along time.
+        variable : str
+            String representing variable in the files to be uploaded. If
+            None, this will attempt to load all available datasets.
+        collection : str
+            Coverage ID. Defaults to the first file's stem without its
+            trailing date digits (see `make_series_ingredients`).
+        mock : bool
+            If true, no data will be loaded, the process will only be
+            checked for validity.
+        quiet : bool
+            Capture the output of wcst_import instead of printing it.
+            Defaults to False.
+        force : bool
+            Import every file even if the manifest lists it as already
+            imported. Defaults to False.
+
+        Returns
+        -------
+        subprocess.CompletedProcess | None : The finished wcst_import run,
+            or None if every file was skipped as unchanged.
+        """
+        if isinstance(paths, (str, Path)):
+            paths = glob.glob(str(paths))
+        if paths and collection is None:
+            collection = self._series_id(paths)
+        paths = [path for path in paths
+                 if not self._skip([path], mock, force, quiet, collection)]
+        if not paths:
+            return None
+
+        ingredients = self.make_series_ingredients(
+            paths,
+            variable=variable,
+            collection=collection,
+            mock=mock
+        )
+        out = self._run_import(ingredients, quiet=quiet)
+        if not mock:
+            self._record(ingredients["input"]["paths"], ingredients, out)
+        return out
 
     def make_ingredients(self, path, variable, mock=False):
         """Make an ingredients JSON for a file.
@@ -321,13 +2422,101 @@ class Importer(RDBC):
             checked for validity.
         """
         driver = self.get_driver(path)
-        if driver == "Network Common Data Format":
+        if driver == NETCDF_DRIVER:
             ingredients = self._ingredients_nc(path, variable, mock=mock)
         else:
             raise NotImplementedError(f"Haven't figured {driver} method out"
                                       "yet")
         return ingredients
 
+    def make_series_ingredients(self, paths, variable=None, collection=None,
+                                mock=False):
+        """Make one ingredients JSON for a series of files of one coverage.
+
+        The files are ordered by their first time value and their combined
+        time axis is checked for duplicate or overlapping time steps. The
+        time axis is declared with per-file expressions, so a single
+        wcst_import run appends every file's slices. When the coverage
+        already exists, its time axis keeps its regular or irregular type.
+
+        Parameters
+        ----------
+        paths : str | list
+            Glob pattern or list of NetCDF files that together make up one
+            coverage along time. All files need the same dimensions,
+            variables and time units.
+        variable : str
+            String representing variable in the files to be uploaded. If
+            None, all available datasets are uploaded.
+        collection : str
+            Coverage ID. Defaults to the first file's stem without trailing
+            digits, dashes and underscores (e.g. "pdsi_1895_10" -> "pdsi").
+        mock : bool
+            If true, no data will be loaded, the process will only be
+            checked for validity.
+
+        Returns
+        -------
+        dict : The ingredients document.
+        """
+        if isinstance(paths, (str, Path)):
+            paths = glob.glob(str(paths))
+        if not paths:
+            raise FileNotFoundError("No files found for the series.")
+        metas = [self.scan(path) for path in paths]
+
+        # Check that the files describe the same coverage
+        for key in ["dims", "variables"]:
+            values = {json.dumps(meta[key], sort_keys=True) for meta in metas}
+            if len(values) > 1:
+                raise ValueError(f"Files in the series have different {key}: "
+                                 f"{sorted(values)}")
+        units = {_cf_seconds(meta["time_units"]) for meta in metas
+                 if meta["time"]}
+        if len(units) > 1:
+            raise ValueError("Files in the series have different time units: "
+                             f"{sorted({m['time_units'] for m in metas})}")
+
+        # Order files by time and check the combined axis
+        metas = [meta for meta in metas if meta["time"]]
+        metas.sort(key=lambda meta: np.datetime64(meta["time"][0]))
+        times = np.array([t for meta in metas for t in meta["time"]],
+                        dtype="datetime64[ns]")
+        if (np.diff(times) <= np.timedelta64(0)).any():
+            raise ValueError("Files in the series have duplicate or "
+                             "overlapping time steps.")
+
+        paths = [meta["path"] for meta in metas]
+        if collection is None:
+            collection = self._series_id(paths)
+
+        # Slices added to an existing coverage keep its time axis type
+        domain = None
+        if collection in self.collections:
+            domain = self.domain(collection, refresh=True)
+
+        ingredients = self._ingredients_nc(paths[0], variable, mock=mock,
+                                           domain=domain)
+        ingredients["input"]["coverage_id"] = collection
+        ingredients["input"]["paths"] = paths
+        options = ingredients["recipe"]["options"]
+        options["import_order"] = "ascending"
+        options["tiling"] = self._tiling(metas[0], variable, times.size)
+
+        # Time positions have to come from each file
+        time_var = metas[0]["dims"]["time"]
+        time_key, time_recipe = self._series_time_recipe(
+            time_var,
+            *units,
+            step=_declared_step(domain, times)
+        )
+        axes = options["coverage"]["slicer"]["axes"]
+        axes.pop(time_key)
+        axes = {time_key: time_recipe, **axes}
+        options["coverage"]["slicer"]["axes"] = axes
+
+        return ingredients
+
     @property
     def sample(self, type="netcdf"):
         """Read in a sample ingredients file"""
@@ -338,6 +2527,30 @@ class Importer(RDBC):
             config = json.load(file)
         return config
 
+    def scan(self, path):
+        """Return the ingredient metadata of a NetCDF file.
+
+        Dimensions, variables, time values, CRS and driver are read in a
+        single open, and the result is memoised on the file's path, size
+        and modification time, so repeated scans of an unchanged file
+        cost a `stat` call.
+
+        Parameters
+        ----------
+        path : str | PosixPath
+            Path to a NetCDF file.
+
+        Returns
+        -------
+        dict : File metadata with "dims" (time/latitude/longitude to the
+            file's dimension name or None), "sizes", "variables", "dtypes",
+            "time" (string time values), "time_units" (the CF units of the
+            time variable), "crs" (the grid mapping variable or None) and
+            "driver". "dtypes" are the stored dtypes, so packed integer
+            variables report their integer type, not the scaled one.
+        """
+        return dict(_scan_nc(*_file_key(path)))
+
     @property
     def template(self):
         """Return the template ingredients file with descriptions."""
@@ -348,11 +2561,11 @@ class Importer(RDBC):
             config = json.load(file)
         return config
 
-    def _ingredients_nc(self, path, variable, mock=False):
+    def _ingredients_nc(self, path, variable, mock=False, domain=None):
         """Create an ingedients JSON for a NetCDF file (a specific format)."""
         # Make sure this path is a Posix path
         path = Path(path)
-        collection = f"{path.stem}".replace("-", "_")
+        collection = _coverage_id(path)
 
         # Create a collection
         # if collection not in self.collections:
@@ -365,12 +2578,12 @@ class Importer(RDBC):
         lat_var = self._find_nc_dim(path, "latitude")
 
         # For now, build the time index explicitly
-        with xr.open_dataset(path, decode_times=True) as ds:
-            if not variable:
-                variables = [v for v in ds if v != "crs"]
-            else:
-                variables = [variable]
-            time = [str(t) for t in ds[time_var].data]
+        meta = self.scan(path)
+        if not variable:
+            variables = meta["variables"]
+        else:
+            variables = [variable]
+        times = meta["time"]
 
         # Build initial config
         config = {
@@ -389,7 +2602,7 @@ class Importer(RDBC):
         }
 
         # Get the appropriate time recipe
-        time_key, time_recipe = self._time_recipe(time)
+        time_key, time_recipe = self._time_recipe(times, domain)
 
         # Define axes
         axes = {
@@ -415,12 +2628,13 @@ class Importer(RDBC):
         recipe = {
             "name": "general_coverage",
             "options": {
-                "tiling": "ALIGNED [0:0, 0:1023, 0:1023] TILE SIZE 4000000",
+                "tiling": self._tiling(meta, variables),
                 "coverage": {
                     "crs": "OGC:AnsiDate+EPSG:4326",
                     "metadata": {
                         "type": "xml",
-                        "global": {}
+                        "global": {},
+                        "bands": {var: "auto" for var in variables}
                     },
                     "slicer": {
                         "type": "netcdf",
@@ -447,18 +2661,231 @@ class Importer(RDBC):
 
         return ingredients
 
-    def _time_recipe(self, time):
-        """Return the appropriate time recipe for the ingredients file."""
+    def _insert_coverage(self, domain, band, pixel_type, tiling):
+        """Register a coverage in petascope with a WCS-T InsertCoverage.
+
+        The coverage document is posted inline as the `coverage`
+        parameter, so petascope doesn't need to read any client file.
+        Petascope creates the coverage's collection with `pixel_type`
+        cells and `tiling`.
+        """
+        params = {
+            "SERVICE": "WCS",
+            "VERSION": "2.0.1",
+            "REQUEST": "InsertCoverage",
+            "useId": "existing",
+            "pixelDataType": pixel_type,
+            "tiling": tiling
+        }
+        try:
+            out = requests.request(
+                url=SERVICE_URL,
+                method="POST",
+                params=params,
+                data={"coverage": _coverage_gml(domain, band)},
+                auth=(USR, PW),
+                timeout=60
+            )
+            out.raise_for_status()
+        finally:
+            self._invalidate(f"create collection {domain.coverage}")
+
+        return out
+
+    def _load_ingredients(self, path, variable, mock):
+        """Return the ingredients of a georeferenced file for `load`."""
+        if not self.get_crs(path):
+            # No need to try and georeference this
+            print(f"No CRS object found in {path}, uploading native "
+                  "geometries...")
+            raise NotImplementedError("I haven't built non-georeferenced "
+                                      "netcdfs into the load method yet.")
+        return self.make_ingredients(path, variable, mock=mock)
+
+    def _record(self, paths, ingredients, out):
+        """Record the outcome of a wcst_import run in the manifest."""
+        if self.manifest is None:
+            return
+        status = "ok" if out.returncode == 0 else "failed"
+        error = None
+        if out.returncode != 0 and out.stderr:
+            error = "\n".join(out.stderr.splitlines()[-20:])
+        coverage = ingredients["input"]["coverage_id"]
+        for path in paths:
+            times = self.scan(path)["time"]
+            time_range = (times[0], times[-1]) if times else (None, None)
+            self.manifest.record(path, coverage, time_range, status, error)
+
+    def _run_import(self, ingredients, quiet=False):
+        """Write ingredients to a unique temporary file and import them."""
+        out = _wcst_import(self.wcst_import, ingredients, quiet=quiet)
+
+        # The run wrote to the coverage behind this object's back
+        if not ingredients["config"]["mock"]:
+            self._invalidate(f"update {ingredients['input']['coverage_id']}")
+
+        return out
+
+    def _series_time_recipe(self, time_var, units, step=None):
+        """Return a time recipe that reads positions from each file.
+
+        `units` is the (seconds per unit, epoch offset) pair returned by
+        `_cf_seconds`, since wcst_import's datetime() takes seconds since
+        the Unix epoch. If the combined axis has a constant `step`, the
+        axis is declared regular and no positions are listed.
+        """
+        scale, offset = units
+        expr = f"{{}} * {scale} + ({offset})"
+        var = f"netcdf:variable:{time_var}"
+
         key = "ansi"
         recipe = {
-            "min": time[0],
-            "max": time[-1],
-            "directPositions": str(list(time)),
+            "min": f"datetime({expr.format('${' + var + ':min}')})",
+            "max": f"datetime({expr.format('${' + var + ':max}')})",
+            "directPositions": (f"[datetime({expr.format('x')}) "
+                                f"for x in ${{{var}}}]"),
             "irregular": True,
             "resolution": "1",
             "gridOrder": 0,
             "crsOrder": 0,
             "type": "ansidate"
         }
+        if step is not None:
+            del recipe["directPositions"], recipe["irregular"]
+            recipe["resolution"] = _time_resolution(step)
 
         return key, recipe
+
+    def _series_id(self, paths):
+        """Return the default coverage ID of a series of files.
+
+        This is the stem of the file with the earliest time value, without
+        trailing digits, dashes and underscores.
+        """
+        metas = [self.scan(path) for path in paths]
+        timed = [meta for meta in metas if meta["time"]]
+        first = metas[0]
+        if timed:
+            first = min(timed, key=lambda meta: np.datetime64(meta["time"][0]))
+        stem = Path(first["path"]).stem
+        return (re.sub(r"[\d_\-]+$", "", stem) or stem).replace("-", "_")
+
+    def _skip(self, paths, mock, force, quiet, coverage=None):
+        """Return True if the manifest says every file is already loaded.
+
+        With a target `coverage`, files last imported into another one
+        count as not loaded.
+        """
+        if self.manifest is None or mock or force:
+            return False
+        if any(self.manifest.changed(path, coverage) for path in paths):
+            return False
+        if not quiet:
+            for path in paths:
+                print(f"{path} is unchanged since its last import, "
+                      "skipping...")
+        return True
+
+    def _tiling(self, meta, variables, ntime=None):
+        """Return the tiling clause for a new coverage from a file scan."""
+        if self.profile is None:
+            return DEFAULT_TILING
+        if not variables:
+            variables = meta["variables"]
+        elif isinstance(variables, str):
+            variables = [variables]
+        itemsize = sum(np.dtype(meta["dtypes"][var]).itemsize
+                       for var in variables)
+        shape = [meta["sizes"][meta["dims"][dim]]
+                 for dim in ["time", "latitude", "longitude"]]
+        if ntime is not None:
+            shape[0] = ntime
+        return plan_tiling(shape, itemsize, self.profile)["clause"]
+
+    def _time_recipe(self, times, domain=None):
+        """Return the appropriate time recipe for the ingredients file.
+
+        Evenly spaced time values get a regular axis with a resolution (in
+        days). Others get an irregular axis, with its positions written as
+        piecewise-regular runs when that is shorter than listing them.
+        Slices added to an existing coverage (with `domain`) follow the
+        type of its time axis instead (see `_declared_step`).
+        """
+        key = "ansi"
+        recipe = {
+            "min": times[0],
+            "max": times[-1],
+            "gridOrder": 0,
+            "crsOrder": 0,
+            "type": "ansidate"
+        }
+
+        values = np.array(times, dtype="datetime64[ns]")
+        step = _declared_step(domain, values)
+        if step is not None:
+            recipe["resolution"] = _time_resolution(step)
+            return key, recipe
+
+        # Runs are seconds since the Unix epoch, as wcst_import's datetime()
+        positions = str(list(times))
+        runs = []
+        i = 0
+        for start, step, count in _time_runs(values):
+            if count > 2:
+                stop = start + step * count
+                runs.append(f"[datetime(x) for x in range({start}, {stop}, "
+                            f"{step})]")
+            else:
+                runs.append(str(list(times[i:i + count])))
+            i += count
+        expression = " + ".join(runs)
+        if len(expression) < len(positions):
+            positions = expression
+
+        recipe["directPositions"] = positions
+        recipe["irregular"] = True
+        recipe["resolution"] = "1"
+
+        return key, recipe
+
+
+def _import_job(wcst_import, path, ingredients):
+    """Run wcst_import for one file in a worker process and report it."""
+    start = time.monotonic()
+    report = {"path": path, "status": "failed", "returncode": None,
+              "error": None}
+    out = None
+    try:
+        out = _wcst_import(wcst_import, ingredients, quiet=True)
+        report["returncode"] = out.returncode
+        if out.returncode == 0:
+            report["status"] = "ok"
+        else:
+            report["error"] = "\n".join(out.stderr.splitlines()[-20:])
+    except Exception as error:  # pylint: disable=broad-except
+        report["error"] = f"{type(error).__name__}: {error}"
+    report["seconds"] = time.monotonic() - start
+
+    return path, report, out
+
+
+def _wcst_import(wcst_import, ingredients, quiet=False):
+    """Write ingredients to a unique temporary file and run wcst_import."""
+    fd, dst = tempfile.mkstemp(prefix="ingredients_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(json.dumps(ingredients, indent=4))
+
+        # Call the import wcst script
+        out = sp.run(
+            f"{str(wcst_import)} {dst} --identity-file ~/.rasdaman",
+            shell=True,
+            check=False,
+            executable="/bin/bash",
+            capture_output=quiet,
+            text=True
+        )
+    finally:
+        os.remove(dst)
+
+    return out
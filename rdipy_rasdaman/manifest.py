@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Persistent record of the files imported into rasdaman.
+
+Author: travis
+Date: Sat Oct 17 10:12:44 AM MST 2026
+"""
+import hashlib
+import sqlite3
+import time
+
+from contextlib import closing
+from pathlib import Path
+
+
+HASH_BLOCK = 2 ** 20
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    hash TEXT,
+    coverage TEXT,
+    time_min TEXT,
+    time_max TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    loaded REAL NOT NULL
+)
+"""
+
+
+def file_hash(path):
+    """Return the BLAKE2b hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """SQLite manifest of imported files keyed by path, size, mtime and hash.
+
+    A file counts as unchanged when its last import succeeded and its size
+    and modification time still match. If only the modification time
+    moved, the content hash decides, so touched but identical files are
+    skipped as well. Every call opens its own connection, which lets the
+    worker processes of `Importer.load_many` share one manifest.
+    """
+
+    def __init__(self, path, timeout=30):
+        """Initialize a Manifest object.
+
+        Parameters
+        ----------
+        path : str | pathlib.PosixPath
+            Path to the SQLite database, created if needed.
+        timeout : int | float
+            Seconds to wait for another process's write lock. Defaults to
+            30.
+        """
+        self.path = Path(path).expanduser().absolute()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        with self._connect() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(SCHEMA)
+
+    def __repr__(self):
+        """Return a Manifest object representation string."""
+        address = hex(id(self))
+        name = self.__class__.__name__
+        msgs = [f"\n   {k}={v}" for k, v in self.stats.items()]
+        msg = " ".join(msgs)
+        return f"<{name} object at {address}>: {msg}"
+
+    def changed(self, path, coverage=None):
+        """Return True if a file is new, modified or failed to import.
+
+        Parameters
+        ----------
+        path : str | pathlib.PosixPath
+            Path to a file to be imported.
+        coverage : str
+            Coverage the file is about to be imported into. A file last
+            imported into another coverage counts as changed. Defaults to
+            None (any coverage).
+
+        Returns
+        -------
+        bool : False if the last successful import holds the same content.
+        """
+        path = Path(path).absolute()
+        entry = self.get(path)
+        if entry is None or entry["status"] != "ok":
+            return True
+        if coverage is not None and entry["coverage"] != coverage:
+            return True
+
+        stat = path.stat()
+        if stat.st_size != entry["size"]:
+            return True
+        if stat.st_mtime == entry["mtime"]:
+            return False
+
+        # Same size, new mtime: only a changed hash means new content
+        if entry["hash"] != file_hash(path):
+            return True
+        with self._connect() as con:
+            con.execute("UPDATE files SET mtime = ? WHERE path = ?",
+                        (stat.st_mtime, str(path)))
+        return False
+
+    def entries(self, coverage=None, status=None):
+        """Return manifest entries, optionally for one coverage or status.
+
+        Parameters
+        ----------
+        coverage : str
+            Only return files imported into this coverage.
+        status : str
+            Only return files with this status ("ok" or "failed").
+
+        Returns
+        -------
+        list : One dict per file, ordered by path.
+        """
+        query = "SELECT * FROM files"
+        clauses = []
+        args = []
+        if coverage is not None:
+            clauses.append("coverage = ?")
+            args.append(coverage)
+        if status is not None:
+            clauses.append("status = ?")
+            args.append(status)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._connect() as con:
+            rows = con.execute(query + " ORDER BY path", args).fetchall()
+        return [dict(row) for row in rows]
+
+    def forget(self, path=None, coverage=None):
+        """Remove one file, one coverage's files, or every entry."""
+        with self._connect() as con:
+            if path is not None:
+                con.execute("DELETE FROM files WHERE path = ?",
+                            (str(Path(path).absolute()),))
+            elif coverage is not None:
+                con.execute("DELETE FROM files WHERE coverage = ?",
+                            (coverage,))
+            else:
+                con.execute("DELETE FROM files")
+
+    def get(self, path):
+        """Return the manifest entry of a file as a dict, or None."""
+        with self._connect() as con:
+            row = con.execute("SELECT * FROM files WHERE path = ?",
+                              (str(Path(path).absolute()),)).fetchone()
+        return None if row is None else dict(row)
+
+    def record(self, path, coverage=None, time_range=(None, None),
+               status="ok", error=None):
+        """Record the outcome of importing a file.
+
+        Parameters
+        ----------
+        path : str | pathlib.PosixPath
+            Path to the imported file.
+        coverage : str
+            Coverage the file was imported into.
+        time_range : tuple
+            First and last time value in the file.
+        status : str
+            "ok" or "failed". Defaults to "ok".
+        error : str
+            Error message of a failed import.
+        """
+        path = Path(path).absolute()
+        stat = path.stat()
+        digest = file_hash(path) if status == "ok" else None
+        row = (str(path), stat.st_size, stat.st_mtime, digest, coverage,
+               time_range[0], time_range[1], status, error, time.time())
+        with self._connect() as con:
+            con.execute("INSERT OR REPLACE INTO files VALUES "
+                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+
+    @property
+    def stats(self):
+        """Return the manifest path and the number of files per status."""
+        with self._connect() as con:
+            rows = con.execute("SELECT status, COUNT(*) FROM files "
+                               "GROUP BY status").fetchall()
+        stats = {"path": str(self.path)}
+        stats.update({status: count for status, count in rows})
+        return stats
+
+    def _connect(self):
+        """Open a connection that commits and closes when the block exits."""
+        return _Connection(self.path, self.timeout)
+
+
+class _Connection:
+    """SQLite connection context that commits on success and closes."""
+
+    def __init__(self, path, timeout):
+        """Initialize a _Connection object."""
+        self.path = path
+        self.timeout = timeout
+        self._con = None
+
+    def __enter__(self):
+        """Open the connection."""
+        self._con = sqlite3.connect(self.path, timeout=self.timeout)
+        self._con.row_factory = sqlite3.Row
+        return self._con
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Commit (or roll back on error) and close the connection."""
+        with closing(self._con):
+            if exc_type is None:
+                self._con.commit()
+            else:
+                self._con.rollback()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Rasdaman tiling clauses and tile-aligned block arithmetic.
+
+Author: travis
+Date: Sat Oct 17 10:12:44 AM MST 2026
+"""
+import itertools
+import math
+import re
+
+
+DEFAULT_TILING = "ALIGNED [0:0, 0:1023, 0:1023] TILE SIZE 4000000"
+PROFILES = ("map", "timeseries", "balanced")
+TILE_BYTES = 4000000
+
+
+def format_tiling(tile_shape, itemsize):
+    """Return an aligned rasdaman tiling clause for a tile shape.
+
+    Parameters
+    ----------
+    tile_shape : tuple
+        Number of cells along each axis of one tile.
+    itemsize : int
+        Bytes per cell (summed over bands).
+
+    Returns
+    -------
+    str : A clause such as "ALIGNED [0:0, 0:1023, 0:1023] TILE SIZE
+        4194304".
+    """
+    extents = ", ".join(f"0:{size - 1}" for size in tile_shape)
+    nbytes = math.prod(tile_shape) * itemsize
+    return f"ALIGNED [{extents}] TILE SIZE {nbytes}"
+
+
+def parse_tiling(clause=DEFAULT_TILING):
+    """Return the tile shape declared in a rasdaman tiling clause.
+
+    Parameters
+    ----------
+    clause : str
+        A tiling clause such as "ALIGNED [0:0, 0:1023, 0:1023] TILE SIZE
+        4000000". Defaults to the tiling the Importer writes.
+
+    Returns
+    -------
+    tuple : Number of cells along each axis of one tile. Open-ended axes
+        ("*") are returned as None.
+    """
+    match = re.search(r"\[([^\]]*)\]", clause)
+    if not match:
+        raise ValueError(f"No tile configuration found in '{clause}'.")
+
+    shape = []
+    for part in match.group(1).split(","):
+        lo, hi = [p.strip() for p in part.split(":")]
+        if "*" in (lo, hi):
+            shape.append(None)
+        else:
+            shape.append(int(hi) - int(lo) + 1)
+
+    return tuple(shape)
+
+
+def tile_blocks(bounds, tile_shape, origin=None):
+    """Split inclusive grid bounds into blocks aligned to a tile grid.
+
+    Parameters
+    ----------
+    bounds : list
+        Inclusive (lo, hi) grid indices along each axis.
+    tile_shape : tuple
+        Number of cells along each axis of one tile. None leaves an axis
+        unsplit.
+    origin : list
+        Grid index where tiles start along each axis (the collection's
+        lower bound). Defaults to 0 on every axis.
+
+    Yields
+    ------
+    tuple : Inclusive (lo, hi) bounds of one block along each axis, in
+        C order over the blocks.
+    """
+    if origin is None:
+        origin = [0] * len(bounds)
+
+    edges = []
+    for (lo, hi), size, start in zip(bounds, tile_shape, origin):
+        if size is None:
+            edges.append([(lo, hi)])
+            continue
+        axis = []
+        while lo <= hi:
+            stop = min(start + ((lo - start) // size + 1) * size - 1, hi)
+            axis.append((lo, stop))
+            lo = stop + 1
+        edges.append(axis)
+
+    yield from itertools.product(*edges)
+
+
+def plan_tiling(shape, itemsize, profile="balanced", tile_bytes=TILE_BYTES):
+    """Choose a tiling for a (time, y, x) grid and a typical access pattern.
+
+    Tiles hold about `tile_bytes` each. A "map" profile keeps one time step
+    per tile so reading a map touches as few tiles as possible, a
+    "timeseries" profile stacks as many time steps as fit into each tile so
+    a pixel's series touches few tiles, and "balanced" picks the time depth
+    (a power of two) minimizing the combined cost of both queries, counting
+    a fixed overhead per tile plus the bytes read.
+
+    Parameters
+    ----------
+    shape : tuple
+        Number of cells along each axis. The first axis of a 3D grid is
+        time, the last two are spatial.
+    itemsize : int
+        Bytes per cell (summed over bands).
+    profile : str
+        Declared access pattern: "map", "timeseries" or "balanced".
+        Defaults to "balanced".
+    tile_bytes : int
+        Target size of one tile in bytes. Defaults to 4 MB.
+
+    Returns
+    -------
+    dict : "clause" (the tiling clause), "tile_shape", "tile_size" (bytes
+        per tile) and "tiles_per_query", the estimated tiles one full map
+        ("map") and one full pixel time series ("timeseries") read.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown access profile '{profile}', use one of "
+                         f"{PROFILES}.")
+    if len(shape) not in (2, 3):
+        raise ValueError("Tiling plans need a (y, x) or (time, y, x) grid.")
+
+    shape = tuple(int(size) for size in shape)
+    cells = max(tile_bytes // itemsize, 1)
+    if len(shape) == 2:
+        tile_shape = _spatial_tile(shape, cells)
+    else:
+        if profile == "map":
+            depths = [1]
+        elif profile == "timeseries":
+            depths = [min(shape[0], cells)]
+        else:
+            depths = sorted({min(2 ** i, shape[0])
+                             for i in range(shape[0].bit_length() + 1)})
+        plans = [(depth, *_spatial_tile(shape[1:], cells // depth))
+                 for depth in depths]
+        tile_shape = min(plans,
+                         key=lambda plan: _query_cost(shape, plan, cells))
+
+    return {
+        "clause": format_tiling(tile_shape, itemsize),
+        "tile_shape": tile_shape,
+        "tile_size": math.prod(tile_shape) * itemsize,
+        "tiles_per_query": _tiles_per_query(shape, tile_shape)
+    }
+
+
+def _query_cost(shape, tile_shape, cells):
+    """Return the summed relative cost of a map and a time series query.
+
+    Each touched tile costs a fixed overhead plus its size relative to the
+    target tile, and each query's cost is relative to the best any tiling
+    could do for it.
+    """
+    counts = _tiles_per_query(shape, tile_shape)
+    size = math.prod(tile_shape) / cells
+    cost = 0
+    for query, useful in [("map", math.prod(shape[1:])),
+                          ("timeseries", shape[0])]:
+        best = math.ceil(useful / cells) + useful / cells
+        cost += counts[query] * (1 + size) / best
+    return cost
+
+
+def _spatial_tile(shape, cells):
+    """Return a near-square (y, x) tile of about `cells` cells."""
+    side = max(int(math.sqrt(max(cells, 1))), 1)
+    y = min(side, shape[0])
+    x = min(max(cells // y, 1), shape[1])
+    y = min(max(cells // x, 1), shape[0])
+    return y, x
+
+
+def _tiles_per_query(shape, tile_shape):
+    """Return tiles touched by one full map and one pixel's time series."""
+    tiles = [math.ceil(size / tile) for size, tile in zip(shape, tile_shape)]
+    if len(shape) == 2:
+        return {"map": tiles[0] * tiles[1], "timeseries": 1}
+    return {"map": tiles[1] * tiles[2], "timeseries": tiles[0]}
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Tests for rdipy_rasdaman."""
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Tests for rdipy_rasdaman.caches.
+
+Author: travis
+Date: Sat Oct 17 10:12:44 AM MST 2026
+"""
+import tempfile
+import unittest
+
+import numpy as np
+
+from rdipy_rasdaman.caches import TileCache
+
+
+class TestTileCache(unittest.TestCase):
+    """Tile storage and write generations."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.cache = TileCache(self.directory)
+        self.key = ((0, 9), (0, 9))
+        self.tile = np.arange(100, dtype="float32").reshape(10, 10)
+
+    def test_round_trip(self):
+        """Stored tiles come back read-only and count as hits."""
+        version = self.cache.version("a")
+        self.assertIsNone(self.cache.get("a", self.key, version))
+        self.cache.put("a", self.key, self.tile, version)
+        out = self.cache.get("a", self.key, version)
+        np.testing.assert_array_equal(out, self.tile)
+        self.assertFalse(out.flags.writeable)
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertEqual(self.cache.stats["misses"], 1)
+
+    def test_invalidate_collection(self):
+        """Invalidating a collection only bumps its own version."""
+        self.assertEqual(self.cache.version("a"), "0.0")
+        self.cache.put("a", self.key, self.tile, self.cache.version("a"))
+        self.cache.put("b", self.key, self.tile, self.cache.version("b"))
+
+        self.cache.invalidate("a")
+        self.assertEqual(self.cache.generation("a"), 1)
+        self.assertEqual(self.cache.version("a"), "0.1")
+        self.assertEqual(self.cache.version("b"), "0.0")
+        self.assertIsNone(self.cache.get("a", self.key, "0.0"))
+        self.assertIsNotNone(self.cache.get("b", self.key, "0.0"))
+
+    def test_invalidate_all(self):
+        """Invalidating the cache bumps every version, keeps generations."""
+        self.cache.invalidate("a")
+        self.cache.put("b", self.key, self.tile, self.cache.version("b"))
+
+        self.cache.invalidate()
+        self.assertEqual(self.cache.generation(), 1)
+        self.assertEqual(self.cache.version("a"), "1.1")
+        self.assertEqual(self.cache.version("b"), "1.0")
+        self.assertIsNone(self.cache.get("b", self.key, "0.0"))
+
+    def test_late_put(self):
+        """Tiles read before a write are never served after it."""
+        version = self.cache.version("a")
+        self.cache.invalidate("a")
+        self.cache.put("a", self.key, self.tile, version)
+        self.assertIsNone(
+            self.cache.get("a", self.key, self.cache.version("a"))
+        )
+
+    def test_shared_generations(self):
+        """Caches on the same directory see each other's invalidations."""
+        other = TileCache(self.directory)
+        other.invalidate("a")
+        self.assertEqual(self.cache.version("a"), other.version("a"))
+        self.assertEqual(self.cache.generation("a"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
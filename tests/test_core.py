@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Tests for rdipy_rasdaman.core with the database and petascope stubbed.
+
+Author: travis
+Date: Sat Oct 17 10:12:44 AM MST 2026
+"""
+import unittest
+
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+from rdipy_rasdaman import core
+
+
+class TestInsertArray(unittest.TestCase):
+    """Importer.insert_array against mocked rasdapy and petascope."""
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(core, "DBConnector"),
+            mock.patch.object(core, "QueryExecutor"),
+            mock.patch.object(core, "RMANHOME", "/opt/rasdaman"),
+            mock.patch.object(core.requests, "request"),
+            mock.patch.object(core.Importer, "collections",
+                              new_callable=mock.PropertyMock,
+                              return_value=[]),
+            mock.patch.object(core.Importer, "domain"),
+            mock.patch.object(core.Importer, "dropcol"),
+            mock.patch.object(core.Importer, "sdom",
+                              return_value=([0, 0, 0], [3, 2, 1])),
+            mock.patch.object(core.Importer, "write")
+        ]
+        mocks = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+        self.request, *_, self.dropcol, self.sdom, self.write = mocks[3:]
+
+        self.array = np.arange(24, dtype="float32").reshape(4, 3, 2)
+        self.coords = {
+            "time": np.array(["2020-01-01", "2020-01-02", "2020-01-04",
+                              "2020-01-05"], dtype="datetime64[ns]"),
+            "latitude": np.array([40.0, 40.5, 41.0]),
+            "longitude": np.array([-105.0, -104.5])
+        }
+        self.importer = core.Importer(manifest=None, profile="timeseries")
+        self.importer.read = mock.Mock(
+            return_value=SimpleNamespace(data=[])
+        )
+
+    def test_coverage_document(self):
+        """The posted GML carries the domain and an empty range set."""
+        self.importer.insert_array("test", self.array, self.coords)
+
+        kwargs = self.request.call_args.kwargs
+        self.assertEqual(kwargs["params"]["REQUEST"], "InsertCoverage")
+        self.assertEqual(kwargs["params"]["pixelDataType"], "Float32")
+        self.assertNotIn("coverageRef", kwargs["params"])
+
+        gml = kwargs["data"]["coverage"]
+        self.assertIn('<gml:tupleList ts="," cs=" "/>', gml)
+        domain = core.CoverageDomain.from_gml("test", gml.encode())
+        self.assertEqual(domain.coverage, "test")
+        self.assertEqual(domain.low, [0, 0, 0])
+        self.assertEqual(domain.high, [3, 2, 1])
+        self.assertIn("ansi", domain.irregular)
+        for label, values in zip(domain.labels, self.coords.values()):
+            np.testing.assert_array_equal(domain.coords[label], values)
+
+    def test_query_sequence(self):
+        """The first tile is inserted, the others update the object."""
+        tiling = core.plan_tiling(self.array.shape, 4, "timeseries")
+        tile_shape = core.parse_tiling(tiling["clause"])
+        self.importer.insert_array("test", self.array, self.coords)
+
+        self.importer.read.assert_called_once_with(
+            "select oid(c) from test as c"
+        )
+        queries = [call.args[0] for call in self.write.call_args_list]
+        self.assertTrue(queries[0].startswith("insert into test values "
+                                              "shift($1, [0,0,0]) tiling"))
+        for query in queries[1:]:
+            self.assertTrue(query.startswith("update test as c set c "
+                                             "assign shift($1, ["))
+
+        # The tiles cover the array exactly once
+        covered = np.zeros(self.array.shape, dtype=int)
+        for call in self.write.call_args_list:
+            shift = call.args[0].split("[")[1].split("]")[0]
+            start = [int(value) for value in shift.split(",")]
+            tile = call.args[1]
+            for axis, size in enumerate(tile_shape):
+                if size is not None:
+                    self.assertLessEqual(tile.shape[axis], size)
+            slices = tuple(slice(lo, lo + size) for lo, size
+                           in zip(start, tile.shape))
+            np.testing.assert_array_equal(tile, self.array[slices])
+            covered[slices] += 1
+        self.assertTrue((covered == 1).all())
+        self.dropcol.assert_not_called()
+
+    def test_existing_object(self):
+        """Only updates are sent when petascope created an object."""
+        self.importer.read.return_value = SimpleNamespace(data=[1])
+        self.importer.insert_array("test", self.array, self.coords)
+
+        queries = [call.args[0] for call in self.write.call_args_list]
+        self.assertTrue(all(query.startswith("update ")
+                            for query in queries))
+
+    def test_sdom_mismatch(self):
+        """The coverage is dropped when the written bounds are off."""
+        self.sdom.return_value = ([0, 0, 0], [2, 2, 1])
+        with self.assertRaises(core.RasdamanQueryError):
+            self.importer.insert_array("test", self.array, self.coords)
+        self.dropcol.assert_called_once_with("test")
+
+
+if __name__ == "__main__":
+    unittest.main()
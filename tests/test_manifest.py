@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Tests for rdipy_rasdaman.manifest.
+
+Author: travis
+Date: Sat Oct 17 10:12:44 AM MST 2026
+"""
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from rdipy_rasdaman.manifest import Manifest
+
+
+class TestChanged(unittest.TestCase):
+    """Manifest.changed decisions."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.manifest = Manifest(self.directory.joinpath("manifest.sqlite"))
+        self.path = self.directory.joinpath("file.nc")
+        self.path.write_bytes(b"0123456789")
+
+    def touch(self, seconds=10):
+        """Move the file's modification time forward."""
+        stat = self.path.stat()
+        os.utime(self.path, (stat.st_atime, stat.st_mtime + seconds))
+
+    def test_new(self):
+        """Files not in the manifest are changed."""
+        self.assertTrue(self.manifest.changed(self.path))
+
+    def test_unchanged(self):
+        """Recorded files with the same stat are unchanged."""
+        self.manifest.record(self.path, coverage="cov")
+        self.assertFalse(self.manifest.changed(self.path))
+        self.assertFalse(self.manifest.changed(self.path, coverage="cov"))
+
+    def test_size(self):
+        """A new size means new content."""
+        self.manifest.record(self.path, coverage="cov")
+        self.path.write_bytes(b"01234567890")
+        self.assertTrue(self.manifest.changed(self.path))
+
+    def test_touched(self):
+        """A new mtime with the same content is not a change."""
+        self.manifest.record(self.path, coverage="cov")
+        self.touch()
+        self.assertFalse(self.manifest.changed(self.path))
+        entry = self.manifest.get(self.path)
+        self.assertEqual(entry["mtime"], self.path.stat().st_mtime)
+
+    def test_rewritten(self):
+        """Same size and new mtime with different content is a change."""
+        self.manifest.record(self.path, coverage="cov")
+        self.path.write_bytes(b"9876543210")
+        self.touch()
+        self.assertTrue(self.manifest.changed(self.path))
+
+    def test_failed(self):
+        """Failed imports are retried."""
+        self.manifest.record(self.path, coverage="cov", status="failed",
+                             error="boom")
+        self.assertTrue(self.manifest.changed(self.path))
+
+    def test_other_coverage(self):
+        """Files imported into another coverage are changed."""
+        self.manifest.record(self.path, coverage="cov")
+        self.assertTrue(self.manifest.changed(self.path, coverage="other"))
+
+    def test_forget(self):
+        """Forgotten files are changed again."""
+        self.manifest.record(self.path, coverage="cov")
+        self.manifest.forget(coverage="cov")
+        self.assertTrue(self.manifest.changed(self.path))
+        self.assertEqual(self.manifest.entries(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
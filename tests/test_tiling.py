@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Tests for rdipy_rasdaman.tiling.
+
+Author: travis
+Date: Sat Oct 17 10:12:44 AM MST 2026
+"""
+import math
+import unittest
+
+from rdipy_rasdaman.tiling import (DEFAULT_TILING, format_tiling,
+                                   parse_tiling, plan_tiling, tile_blocks)
+
+
+class TestClauses(unittest.TestCase):
+    """Formatting and parsing tiling clauses."""
+
+    def test_default(self):
+        """The default clause parses to one time step per tile."""
+        self.assertEqual(parse_tiling(), (1, 1024, 1024))
+        self.assertEqual(parse_tiling(DEFAULT_TILING), (1, 1024, 1024))
+
+    def test_round_trip(self):
+        """Formatted clauses parse back to the same tile shape."""
+        clause = format_tiling((8, 256, 512), 4)
+        self.assertEqual(clause, "ALIGNED [0:7, 0:255, 0:511] TILE SIZE "
+                                 f"{8 * 256 * 512 * 4}")
+        self.assertEqual(parse_tiling(clause), (8, 256, 512))
+
+    def test_open_axes(self):
+        """Open-ended axes parse to None."""
+        clause = "ALIGNED [0:*, 0:99] TILE SIZE 4000000"
+        self.assertEqual(parse_tiling(clause), (None, 100))
+
+    def test_invalid(self):
+        """Clauses without a tile configuration are rejected."""
+        with self.assertRaises(ValueError):
+            parse_tiling("REGULAR TILE SIZE 4000000")
+
+
+class TestPlanTiling(unittest.TestCase):
+    """Tiling plans for the declared access profiles."""
+
+    shape = (365, 720, 1440)
+
+    def check_plan(self, plan, itemsize=4, tile_bytes=4000000):
+        """Check a plan is consistent and its tiles fit the target."""
+        self.assertEqual(parse_tiling(plan["clause"]), plan["tile_shape"])
+        self.assertEqual(plan["tile_size"],
+                         math.prod(plan["tile_shape"]) * itemsize)
+        self.assertLessEqual(plan["tile_size"], tile_bytes)
+        for size, tile in zip(self.shape, plan["tile_shape"]):
+            self.assertLessEqual(tile, size)
+
+    def test_map(self):
+        """Map tiles hold one time step."""
+        plan = plan_tiling(self.shape, 4, "map")
+        self.check_plan(plan)
+        self.assertEqual(plan["tile_shape"][0], 1)
+        self.assertEqual(plan["tiles_per_query"]["timeseries"], 365)
+
+    def test_timeseries(self):
+        """Time series tiles hold every time step that fits."""
+        plan = plan_tiling(self.shape, 4, "timeseries")
+        self.check_plan(plan)
+        self.assertEqual(plan["tile_shape"][0], 365)
+        self.assertEqual(plan["tiles_per_query"]["timeseries"], 1)
+
+    def test_balanced(self):
+        """Balanced tiles trade off between both queries."""
+        plans = {profile: plan_tiling(self.shape, 4, profile)
+                 for profile in ("map", "timeseries", "balanced")}
+        self.check_plan(plans["balanced"])
+        depth = plans["balanced"]["tile_shape"][0]
+        self.assertEqual(depth & (depth - 1), 0)
+        counts = {profile: plan["tiles_per_query"]
+                  for profile, plan in plans.items()}
+        self.assertLess(counts["balanced"]["timeseries"],
+                        counts["map"]["timeseries"])
+        self.assertLess(counts["balanced"]["map"],
+                        counts["timeseries"]["map"])
+
+    def test_small_grid(self):
+        """Grids smaller than a tile fit into one tile."""
+        plan = plan_tiling((3, 10, 20), 8, "balanced")
+        self.assertLessEqual(plan["tile_shape"][1:], (10, 20))
+        self.assertEqual(plan["tiles_per_query"]["map"], 1)
+
+    def test_2d(self):
+        """2D grids get a spatial tile."""
+        plan = plan_tiling((720, 1440), 4, "map")
+        self.assertEqual(len(plan["tile_shape"]), 2)
+        self.assertEqual(plan["tiles_per_query"]["timeseries"], 1)
+
+    def test_invalid(self):
+        """Unknown profiles and grid ranks are rejected."""
+        with self.assertRaises(ValueError):
+            plan_tiling(self.shape, 4, "random")
+        with self.assertRaises(ValueError):
+            plan_tiling((10,), 4)
+
+
+class TestTileBlocks(unittest.TestCase):
+    """Splitting grid bounds on a tile grid."""
+
+    def test_aligned(self):
+        """Blocks end on tile edges counted from the origin."""
+        blocks = list(tile_blocks([(3, 12)], (5,)))
+        self.assertEqual(blocks, [((3, 4),), ((5, 9),), ((10, 12),)])
+        blocks = list(tile_blocks([(3, 12)], (5,), origin=[2]))
+        self.assertEqual(blocks, [((3, 6),), ((7, 11),), ((12, 12),)])
+
+    def test_unsplit_axis(self):
+        """Axes without a tile size stay whole."""
+        blocks = list(tile_blocks([(0, 9), (0, 3)], (None, 2)))
+        self.assertEqual(blocks, [((0, 9), (0, 1)), ((0, 9), (2, 3))])
+
+
+if __name__ == "__main__":
+    unittest.main()